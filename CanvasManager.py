@@ -1,38 +1,75 @@
 import tkinter as tk
+import logging
 import math
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Callable
+from Mode import Mode
+
+logger = logging.getLogger(__name__)
+
+# Squared length, in pixels, below which freehand motion is folded into the stroke's next point instead of drawn.
+MIN_SEGMENT_LENGTH_SQ = 4
+
+# Rotation is always a quarter turn, so its cosine and sine are fixed once at import, with their exact values
+# rather than the float noise math.cos/math.sin would give.
+QUARTER_TURN_COS = 0.0
+QUARTER_TURN_SIN = 1.0
+
+# Delay, in milliseconds, over which motion events are gathered before the canvas is updated: about one
+# frame at 60Hz, so input devices reporting faster than the screen refreshes cause no extra canvas work.
+FRAME_INTERVAL_MS = 16
 
 
 class CanvasManager:
     """
     Manages all canvas operations including drawing, moving, and deleting graphical objects.
     """
-    def __init__(self, canvas: tk.Canvas, line_id_to_segments: Dict[int, List[int]], settings_manager: Any, lines: List[List[int]]) -> None:
+    def __init__(self, canvas: tk.Canvas, line_id_to_segments: Dict[int, List[int]], settings_manager: Any, lines: Dict[int, List[int]], spatial_index: Any,
+                 item_meta: Dict[int, Dict[str, Any]], draw_queue: List[Tuple[int, int]], selection: Any) -> None:
         """
         Initializes the CanvasManager with necessary references.
 
         :param canvas: The canvas on which all drawings are made.
-        :param line_id_to_segments: Dictionary mapping line IDs to their respective segments.
+        :param line_id_to_segments: Every object on the canvas, mapping its item ID to a list holding that ID.
         :param settings_manager: Manages settings such as line width and color.
-        :param lines: List of all line segments.
+        :param lines: All lines, keyed by their item ID.
+        :param spatial_index: Grid index of item positions used for hit-testing.
+        :param item_meta: Python-side mirror of each item's type and style options.
+        :param draw_queue: Freehand points waiting to be added to the stroke being drawn.
+        :param selection: The shared selection state holding the currently selected graphical object.
         """
         self.canvas: tk.Canvas = canvas
+        # Canvas methods called for every motion event or preview redraw, bound once at startup.
+        self.move_item: Callable = canvas.move
+        self.set_coords: Callable = canvas.coords
         self.start_x: Optional[int] = None
         self.start_y: Optional[int] = None
         self.current_circle: Optional[int] = None
         self.current_rectangle: Optional[int] = None
         self.current_triangle: Optional[int] = None
+        self.pending_preview: Optional[Tuple[int, int]] = None
+        self.preview_redraw: Optional[Callable[[int, int], None]] = None
+        self.redraw_scheduled: bool = False
         self.polygon_points: List[Tuple[int, int]] = []
-        self.current_line_segments: List[int] = []
-        self.lines: List[List[int]] = lines
+        self.polygon_preview: Optional[int] = None
+        self.current_stroke: Optional[int] = None
+        self.stroke_points: List[int] = []
+        self.lines: Dict[int, List[int]] = lines
         self.line_id_to_segments: Dict[int, List[int]] = line_id_to_segments
+        self.stroke_width: int = 1
         self.prev_x: Optional[int] = None
         self.prev_y: Optional[int] = None
-        self.selected_line_id: Optional[int] = None
+        self.selection: Any = selection
         self.eraser_size: int = 0
-        self.moving_line_segments: List[int] = []
-        self.mode: Optional[str] = None
+        self.move_tag: Any = None
+        self.mode: Optional[Mode] = None
         self.settings_manager: Any = settings_manager
+        self.spatial_index: Any = spatial_index
+        self.item_meta: Dict[int, Dict[str, Any]] = item_meta
+        self.move_origin: Optional[Tuple[int, int]] = None
+        self.draw_queue: List[Tuple[int, int]] = draw_queue
+        self.flush_scheduled: bool = False
+        self.pending_move: Optional[Tuple[int, int]] = None
+        self.move_scheduled: bool = False
 
     def set_event_handler(self, event_handler: Any) -> None:
         """
@@ -46,11 +83,18 @@ class CanvasManager:
         """
         Begins the process of drawing a circle using the initial mouse event coordinates.
 
+        The preview circle is created once here at zero radius and reshaped while the mouse moves.
+
         :param event: The mouse event with the initial coordinates.
         """
         self.start_x = event.x
         self.start_y = event.y
-        self.current_circle = None
+        self.current_circle = self.canvas.create_oval(
+            event.x, event.y, event.x, event.y,
+            outline="", fill="black", width=self.settings_manager.current_line_width, tags="stroke"
+        )
+        self.item_meta[self.current_circle] = {'type': 'oval', 'width': self.settings_manager.current_line_width,
+                                   'fill': "black", 'outline': ""}
 
     def draw_circle(self, event: tk.Event) -> None:
         """
@@ -58,14 +102,21 @@ class CanvasManager:
 
         :param event: The mouse event with the current coordinates.
         """
-        if self.current_circle:
-            self.canvas.delete(self.current_circle)
-        radius = ((event.x - self.start_x) ** 2 + (event.y - self.start_y) ** 2) ** 0.5
-        self.current_circle = self.canvas.create_oval(
-            self.start_x - radius, self.start_y - radius,
-            self.start_x + radius, self.start_y + radius,
-            outline="",fill="black", width=self.settings_manager.current_line_width
-        )
+        self.schedule_preview(event, self.redraw_circle)
+
+    def redraw_circle(self, x: int, y: int) -> None:
+        """
+        Reshapes the circle preview so that its edge passes through the given point.
+
+        :param x: The x-coordinate of the latest mouse position.
+        :param y: The y-coordinate of the latest mouse position.
+        """
+        if self.start_x is None or self.start_y is None:
+            return
+        radius = math.hypot(x - self.start_x, y - self.start_y)
+        self.set_coords(self.current_circle,
+                        self.start_x - radius, self.start_y - radius,
+                        self.start_x + radius, self.start_y + radius)
 
     def finish_circle(self, event: tk.Event) -> None:
         """
@@ -73,26 +124,30 @@ class CanvasManager:
 
         :param event: The mouse event when the drawing is completed.
         """
-        if self.current_circle:
-            self.canvas.delete(self.current_circle)
-        radius = ((event.x - self.start_x) ** 2 + (event.y - self.start_y) ** 2) ** 0.5
-        circle_id = self.canvas.create_oval(
-            self.start_x - radius, self.start_y - radius,
-            self.start_x + radius, self.start_y + radius,
-            outline="",fill="black", width=self.settings_manager.current_line_width
-        )
-        self.line_id_to_segments[circle_id] = [circle_id]
+        if self.current_circle is None:
+            return
+        self.cancel_preview()
+        self.redraw_circle(event.x, event.y)
+        self.line_id_to_segments[self.current_circle] = [self.current_circle]
+        self.spatial_index.add_shape(self.current_circle, self.canvas.coords(self.current_circle), 'oval')
         self.current_circle = None
 
     def start_rectangle(self, event: tk.Event) -> None:
         """
         Initiates the drawing of a rectangle based on the starting mouse event coordinates.
 
+        The preview rectangle is created once here at zero size and reshaped while the mouse moves.
+
         :param event: The mouse event with the initial coordinates.
         """
         self.start_x = event.x
         self.start_y = event.y
-        self.current_rectangle = None
+        self.current_rectangle = self.canvas.create_rectangle(
+            event.x, event.y, event.x, event.y,
+            outline="", fill="black", width=self.settings_manager.current_line_width, tags="stroke"
+        )
+        self.item_meta[self.current_rectangle] = {'type': 'rectangle', 'width': self.settings_manager.current_line_width,
+                                   'fill': "black", 'outline': ""}
 
     def draw_rectangle(self, event: tk.Event) -> None:
         """
@@ -100,16 +155,23 @@ class CanvasManager:
 
         :param event: The mouse event with the current coordinates.
         """
-        if self.current_rectangle:
-            self.canvas.delete(self.current_rectangle)
-        side_length = min(abs(event.x - self.start_x), abs(event.y - self.start_y))
-        sign_x = 1 if event.x >= self.start_x else -1
-        sign_y = 1 if event.y >= self.start_y else -1
-        self.current_rectangle = self.canvas.create_rectangle(
-            self.start_x, self.start_y,
-            self.start_x + sign_x * side_length, self.start_y + sign_y * side_length,
-            outline="", fill="black", width=self.settings_manager.current_line_width
-        )
+        self.schedule_preview(event, self.redraw_rectangle)
+
+    def redraw_rectangle(self, x: int, y: int) -> None:
+        """
+        Reshapes the rectangle preview into a square between the starting point and the given point.
+
+        :param x: The x-coordinate of the latest mouse position.
+        :param y: The y-coordinate of the latest mouse position.
+        """
+        if self.start_x is None or self.start_y is None:
+            return
+        side_length = min(abs(x - self.start_x), abs(y - self.start_y))
+        sign_x = 1 if x >= self.start_x else -1
+        sign_y = 1 if y >= self.start_y else -1
+        self.set_coords(self.current_rectangle,
+                        self.start_x, self.start_y,
+                        self.start_x + sign_x * side_length, self.start_y + sign_y * side_length)
 
     def finish_rectangle(self, event: tk.Event) -> None:
         """
@@ -117,28 +179,30 @@ class CanvasManager:
 
         :param event: The mouse event when the drawing is completed.
         """
-        if self.current_rectangle:
-            self.canvas.delete(self.current_rectangle)
-        side_length = min(abs(event.x - self.start_x), abs(event.y - self.start_y))
-        sign_x = 1 if event.x >= self.start_x else -1
-        sign_y = 1 if event.y >= self.start_y else -1
-        rectangle_id = self.canvas.create_rectangle(
-            self.start_x, self.start_y,
-            self.start_x + sign_x * side_length, self.start_y + sign_y * side_length,
-            outline="", fill="black", width=self.settings_manager.current_line_width
-        )
-        self.line_id_to_segments[rectangle_id] = [rectangle_id]
+        if self.current_rectangle is None:
+            return
+        self.cancel_preview()
+        self.redraw_rectangle(event.x, event.y)
+        self.line_id_to_segments[self.current_rectangle] = [self.current_rectangle]
+        self.spatial_index.add_shape(self.current_rectangle, self.canvas.coords(self.current_rectangle))
         self.current_rectangle = None
 
     def start_triangle(self, event: tk.Event) -> None:
         """
         Initiates the drawing of a triangle with the first mouse click defining the apex.
 
+        The preview triangle is created once here at zero size and reshaped while the mouse moves.
+
         :param event: The mouse event with the initial coordinates.
         """
         self.start_x = event.x
         self.start_y = event.y
-        self.current_triangle = None
+        self.current_triangle = self.canvas.create_polygon(
+            [event.x, event.y, event.x, event.y, event.x, event.y],
+            outline="", fill="black", width=self.settings_manager.current_line_width, tags="stroke"
+        )
+        self.item_meta[self.current_triangle] = {'type': 'polygon', 'width': self.settings_manager.current_line_width,
+                                   'fill': "black", 'outline': ""}
 
     def draw_triangle(self, event: tk.Event) -> None:
         """
@@ -146,19 +210,26 @@ class CanvasManager:
 
         :param event: The mouse event with the current coordinates.
         """
-        if self.current_triangle:
-            self.canvas.delete(self.current_triangle)
-        height = ((event.x - self.start_x) ** 2 + (event.y - self.start_y) ** 2) ** 0.5  # מרחק מהנקודה הראשונה
+        self.schedule_preview(event, self.redraw_triangle)
+
+    def redraw_triangle(self, x: int, y: int) -> None:
+        """
+        Reshapes the triangle preview with a height equal to the distance to the given point.
+
+        :param x: The x-coordinate of the latest mouse position.
+        :param y: The y-coordinate of the latest mouse position.
+        """
+        if self.start_x is None or self.start_y is None:
+            return
+        height = math.hypot(x - self.start_x, y - self.start_y)  # מרחק מהנקודה הראשונה
         apex_x = self.start_x
         apex_y = self.start_y - height
         left_base_x = self.start_x - height / 2
         left_base_y = self.start_y
         right_base_x = self.start_x + height / 2
         right_base_y = self.start_y
-        self.current_triangle = self.canvas.create_polygon(
-            [apex_x, apex_y, left_base_x, left_base_y, right_base_x, right_base_y],
-            outline="", fill="black", width=self.settings_manager.current_line_width
-        )
+        self.set_coords(self.current_triangle,
+                        apex_x, apex_y, left_base_x, left_base_y, right_base_x, right_base_y)
 
     def finish_triangle(self, event: tk.Event) -> None:
         """
@@ -166,32 +237,62 @@ class CanvasManager:
 
         :param event: The mouse event when the drawing is completed.
         """
-        if self.current_triangle:
-            self.canvas.delete(self.current_triangle)
-        height = ((event.x - self.start_x) ** 2 + (event.y - self.start_y) ** 2) ** 0.5
-        apex_x = self.start_x
-        apex_y = self.start_y - height
-        left_base_x = self.start_x - height / 2
-        left_base_y = self.start_y
-        right_base_x = self.start_x + height / 2
-        right_base_y = self.start_y
-        triangle_id = self.canvas.create_polygon(
-            [apex_x, apex_y, left_base_x, left_base_y, right_base_x, right_base_y],
-            outline="", fill="black", width=self.settings_manager.current_line_width
-        )
-        self.line_id_to_segments[triangle_id] = [triangle_id]
+        if self.current_triangle is None:
+            return
+        self.cancel_preview()
+        self.redraw_triangle(event.x, event.y)
+        self.line_id_to_segments[self.current_triangle] = [self.current_triangle]
+        self.spatial_index.add_shape(self.current_triangle, self.canvas.coords(self.current_triangle), 'polygon')
         self.current_triangle = None
 
+    def schedule_preview(self, event: tk.Event, redraw: Callable[[int, int], None]) -> None:
+        """
+        Records the latest mouse position for a shape preview and schedules a single redraw for the next frame.
+
+        Motion events that arrive before the redraw runs only replace the pending position, so the preview is
+        redrawn at most once per frame no matter how fast the mouse reports motion.
+
+        :param event: The mouse event with the current coordinates.
+        :param redraw: The method that redraws the preview for a given position.
+        """
+        self.pending_preview = (event.x, event.y)
+        self.preview_redraw = redraw
+        if not self.redraw_scheduled:
+            self.redraw_scheduled = True
+            self.canvas.after(FRAME_INTERVAL_MS, self.redraw_pending_preview)
+
+    def redraw_pending_preview(self) -> None:
+        """
+        Redraws the shape preview for the most recent pending mouse position, if any.
+        """
+        self.redraw_scheduled = False
+        if self.pending_preview is not None and self.preview_redraw is not None:
+            x, y = self.pending_preview
+            self.pending_preview = None
+            self.preview_redraw(x, y)
+
+    def cancel_preview(self) -> None:
+        """
+        Drops any pending preview redraw, used when the shape is finalized before the scheduled redraw runs.
+        """
+        self.pending_preview = None
+
     def add_polygon_point(self, event: tk.Event) -> None:
         """
-        Adds a point to the current polygon and draws a line segment to the previous point if applicable.
+        Adds a point to the current polygon and extends the preview outline to it.
+
+        The outline is a single line item created with the second point and given the full point list on
+        every later click, instead of one line item per side.
 
         :param event: The mouse event with the current coordinates.
         """
         self.polygon_points.append((event.x, event.y))
-        if len(self.polygon_points) > 1:
-            self.canvas.create_line(self.polygon_points[-2], self.polygon_points[-1], fill="",
-                                    width=self.settings_manager.current_line_width)
+        if len(self.polygon_points) == 2:
+            self.polygon_preview = self.canvas.create_line(self.polygon_points, fill="",
+                                                           width=self.settings_manager.current_line_width,
+                                                           tags="poly_preview")
+        elif len(self.polygon_points) > 2 and self.polygon_preview is not None:
+            self.canvas.coords(self.polygon_preview, [value for point in self.polygon_points for value in point])
 
     def finish_polygon(self, event: tk.Event) -> None:
         """
@@ -201,19 +302,22 @@ class CanvasManager:
         """
         if len(self.polygon_points) > 2:
             polygon_id = self.canvas.create_polygon(self.polygon_points, outline="", fill="black",
-                                                    width=self.settings_manager.current_line_width)
+                                                    width=self.settings_manager.current_line_width, tags="stroke")
             self.line_id_to_segments[polygon_id] = [polygon_id]
+            self.item_meta[polygon_id] = {'type': 'polygon', 'width': self.settings_manager.current_line_width,
+                                          'fill': "black", 'outline': ""}
+            self.spatial_index.add_shape(polygon_id, [value for point in self.polygon_points for value in point],
+                                         'polygon')
 
         self.polygon_points = []
         self.delete_polygon_lines()  # Call the function to delete the drawing lines
 
     def delete_polygon_lines(self) -> None:
         """
-        Deletes all temporary line segments used for drawing the polygon.
+        Deletes the temporary outline used for drawing the polygon.
         """
-        for segment in self.current_line_segments:
-            self.canvas.delete(segment)
-        self.current_line_segments.clear()  # Clear the list after deleting the segments
+        self.canvas.delete("poly_preview")
+        self.polygon_preview = None
 
     def restart_canvas(self) -> None:
         """
@@ -221,128 +325,234 @@ class CanvasManager:
         """
         self.canvas.delete("all")
         self.lines.clear()
-        self.current_line_segments.clear()
-        self.moving_line_segments.clear()
+        self.current_stroke = None
+        self.stroke_points = []
+        self.draw_queue.clear()
+        self.polygon_preview = None
+        self.move_tag = None
         self.line_id_to_segments.clear()
+        self.item_meta.clear()
+        self.spatial_index.clear()
 
     def move_forward(self) -> None:
         """
         Raises the selected graphical object one layer up in the stack.
         """
-        if self.selected_line_id and self.selected_line_id in self.line_id_to_segments:
-            segments_to_raise = self.line_id_to_segments[self.selected_line_id]
-            for segment in segments_to_raise:
-                self.canvas.tag_raise(segment, None)
+        if self.selection.current in self.line_id_to_segments:
+            self.canvas.tag_raise(self.selection.current, None)
 
     def move_backward(self) -> None:
         """
         Lowers the selected graphical object one layer down in the stack.
         """
-        if self.selected_line_id and self.selected_line_id in self.line_id_to_segments:
-            segments_to_lower = self.line_id_to_segments[self.selected_line_id]
-            for segment in segments_to_lower:
-                self.canvas.tag_lower(segment, None)
+        if self.selection.current in self.line_id_to_segments:
+            self.canvas.tag_lower(self.selection.current, None)
 
     def eraser(self, event) -> None:
         """
         Erases graphical objects within a specified area around the cursor.
 
+        Lines only lose the segments under the eraser; other objects are removed whole.
+
         :param event: The mouse event with the current coordinates.
         """
-        x1, y1 = (event.x - self.eraser_size), (event.y - self.eraser_size)
-        x2, y2 = (event.x + self.eraser_size), (event.y + self.eraser_size)
-        items = self.canvas.find_overlapping(x1, y1, x2, y2)
+        items = self.spatial_index.query_near(event.x, event.y, self.eraser_size)
         for item in items:
-            if item in self.line_id_to_segments:
+            if item not in self.line_id_to_segments:
+                continue
+            if self.item_meta.get(item, {}).get('type') == 'line':
+                self.erase_line_segments(item, event.x, event.y, self.eraser_size)
+            else:
                 self.remove_segment(item)
 
+    def erase_line_segments(self, item: int, x: float, y: float, radius: float) -> None:
+        """
+        Erases the segments of a line that pass within the given distance of a point.
+
+        The line keeps its first remaining run of segments, and every later run becomes a new line stacked
+        right above it, so the pieces keep the line's place among the other objects.
+
+        :param item: The ID of the line.
+        :param x: The x-coordinate of the eraser.
+        :param y: The y-coordinate of the eraser.
+        :param radius: The size of the eraser.
+        """
+        hits = self.spatial_index.segments_near(item, x, y, radius)
+        if not hits:
+            return
+        coords = list(self.spatial_index.points(item))
+        segment_count = len(coords) // 2 - 1
+        runs: List[List[float]] = []
+        start = 0
+        for index in hits + [segment_count]:
+            # Segments start..index-1 survive, spanning points start..index.
+            if index > start:
+                runs.append(coords[2 * start:2 * index + 2])
+            start = index + 1
+        if not runs:
+            self.remove_segment(item)
+            return
+        meta = self.item_meta[item]
+        pad = float(meta['width']) / 2
+        self.canvas.coords(item, *runs[0])
+        self.spatial_index.add_polyline(item, runs[0], pad)
+        below = item
+        for run in runs[1:]:
+            line = self.canvas.create_line(run, fill=meta['fill'], width=meta['width'], tags="stroke")
+            self.canvas.tag_raise(line, below)
+            below = line
+            self.line_id_to_segments[line] = self.lines[line] = [line]
+            self.item_meta[line] = dict(meta)
+            self.spatial_index.add_polyline(line, run, pad)
+
     def remove_segment(self, item) -> None:
         """
         Removes a specific graphical object and updates the associated data structures.
 
-        :param item: The item ID of the segment to remove.
+        :param item: The item ID of the object to remove.
         """
-        if item in self.line_id_to_segments:
+        if self.line_id_to_segments.pop(item, None) is not None:
             self.canvas.delete(item)
-            segments = self.line_id_to_segments.pop(item, [])
-            if segments:
-                index = segments.index(item)
-                before_segments = segments[:index]
-                after_segments = segments[index + 1:]
+            self.item_meta.pop(item, None)
+            self.spatial_index.remove(item)
+            self.lines.pop(item, None)
 
-                if before_segments:
-                    self.lines.append(before_segments)
-                    for seg in before_segments:
-                        self.line_id_to_segments[seg] = before_segments
+    def on_mouse_down(self, event: tk.Event) -> None:
+        """
+        Handles mouse down events, initiating drawing or moving operations.
 
-                if after_segments:
-                    self.lines.append(after_segments)
-                    for seg in after_segments:
-                        self.line_id_to_segments[seg] = after_segments
+        :param event: The mouse event with the starting coordinates.
+        """
+        self.prev_x = event.x
+        self.prev_y = event.y
+        if self.mode == Mode.DRAW:
+            self.current_stroke = None
+            self.stroke_points = [event.x, event.y]
+            # The width cannot change mid-stroke, so it is read once here rather than for every point.
+            self.stroke_width = self.settings_manager.current_line_width
 
-    def draw(self, event: tk.Event) -> None:
+    def on_stroke_press(self, event: tk.Event) -> None:
         """
-        Draws a line segment between the previous and current mouse positions.
+        Handles a click on an item tagged "stroke", selecting it for moving or removing.
 
-        :param event: The mouse event with the current coordinates.
+        Tk only delivers this event when a stroke is under the cursor and reports the hit item as "current",
+        so no hit-test has to be done here.
+
+        :param event: The mouse event with the click coordinates.
         """
-        if self.prev_x is not None and self.prev_y is not None:
-            line = self.canvas.create_line(self.prev_x, self.prev_y, event.x, event.y, fill="black", width=self.settings_manager.current_line_width)
-            self.current_line_segments.append(line)
+        current = self.canvas.find_withtag("current")
+        if not current or current[0] not in self.line_id_to_segments:
+            return
+        selected_line = current[0]
+        self.selection.current = selected_line  # Update the selected line ID
+        if self.mode == Mode.MOVE:
             self.prev_x = event.x
             self.prev_y = event.y
+            self.move_tag = selected_line
+            self.move_origin = (event.x, event.y)
+            self.pending_move = None
+        elif self.mode == Mode.REMOVE:
+            self.Remove_continuous_line(selected_line)
+            self.move_tag = None
 
-    def on_mouse_down(self, event: tk.Event) -> None:
+    def on_draw_motion(self, event: tk.Event) -> None:
         """
-        Handles mouse down events, initiating drawing or moving operations.
+        Handles mouse motion in draw mode, queueing the new point of the stroke.
 
-        :param event: The mouse event with the starting coordinates.
-        """
-        self.prev_x = event.x
-        self.prev_y = event.y
-        selected_line = self.select_line(event.x, event.y)
-        if selected_line:
-            self.selected_line_id = selected_line  # Update the selected line ID
-            if self.mode == "move":
-                self.moving_line_segments = self.line_id_to_segments.get(selected_line, [])
-            elif self.mode == "Remove":
-                self.Remove_continuous_line(selected_line)
-                self.moving_line_segments = []
-
-    def on_mouse_move(self, event: tk.Event) -> None:
+        :param event: The mouse event with the current coordinates.
         """
-        Handles mouse move events, updating positions or continuing to draw based on the mode.
+        prev_x = self.prev_x
+        prev_y = self.prev_y
+        if prev_x is None or prev_y is None:
+            return
+        x = event.x
+        y = event.y
+        dx = x - prev_x
+        dy = y - prev_y
+        # prev_x/prev_y are left in place, so the skipped motion is covered by the next point.
+        if dx * dx + dy * dy < MIN_SEGMENT_LENGTH_SQ:
+            return
+        self.draw_queue.append((x, y))
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.canvas.after(FRAME_INTERVAL_MS, self.flush_draw_queue)
+        self.prev_x = x
+        self.prev_y = y
+
+    def on_move_motion(self, event: tk.Event) -> None:
+        """
+        Handles mouse motion in move mode, dragging the selected object along.
+
+        Only the latest position is kept, and the object is moved to it once per frame.
 
         :param event: The mouse event with the current coordinates.
         """
-        if self.prev_x is not None and self.prev_y is not None:
-            dx = event.x - self.prev_x
-            dy = event.y - self.prev_y
-            if self.mode == "move" and self.moving_line_segments:
-                for line_id in self.moving_line_segments:
-                    self.canvas.move(line_id, dx, dy)
-                self.prev_x = event.x
-                self.prev_y = event.y
-            elif self.mode == "draw":
-                line = self.canvas.create_line(self.prev_x, self.prev_y, event.x, event.y, fill="black",
-                                               width=self.settings_manager.current_line_width)
-                self.current_line_segments.append(line)
-                self.prev_x = event.x
-                self.prev_y = event.y
+        if self.move_tag is None:
+            return
+        self.pending_move = (event.x, event.y)
+        if not self.move_scheduled:
+            self.move_scheduled = True
+            self.canvas.after(FRAME_INTERVAL_MS, self.flush_move)
+
+    def flush_move(self) -> None:
+        """
+        Moves the dragged object to the most recent pending mouse position, if any.
+        """
+        self.move_scheduled = False
+        if self.pending_move is None or self.prev_x is None or self.prev_y is None:
+            return
+        x, y = self.pending_move
+        self.pending_move = None
+        if x != self.prev_x or y != self.prev_y:
+            self.move_item(self.move_tag, x - self.prev_x, y - self.prev_y)
+            self.prev_x = x
+            self.prev_y = y
+
+    def flush_draw_queue(self) -> None:
+        """
+        Extends the stroke being drawn with the queued freehand points.
+
+        The whole stroke is a single multi-point line item: it is created with the first queued points and
+        the later ones are appended to it with one insert call, so the motion events that arrive within one
+        frame cost one round-trip to Tk and a finished stroke is one item rather than one per segment.
+        """
+        self.flush_scheduled = False
+        if not self.draw_queue:
+            return
+        new_points = [value for point in self.draw_queue for value in point]
+        self.draw_queue.clear()
+        if self.current_stroke is None:
+            self.stroke_points.extend(new_points)
+            self.current_stroke = self.canvas.create_line(self.stroke_points, fill="black", width=self.stroke_width,
+                                                          tags="stroke")
+        else:
+            self.canvas.insert(self.current_stroke, "end", new_points)
+            self.stroke_points.extend(new_points)
 
     def on_mouse_release(self, event: tk.Event) -> None:
         """
         Handles mouse release events, finalizing drawing or moving operations.
         """
-        if self.mode == "move":
-            for line_id in self.moving_line_segments:
-                final_coords = self.canvas.coords(line_id)
-            self.moving_line_segments = []
-        elif self.mode == "draw":
-            self.lines.append(self.current_line_segments.copy())
-            for segment in self.current_line_segments:
-                self.line_id_to_segments[segment] = self.current_line_segments.copy()
-            self.current_line_segments = []
+        if self.mode == Mode.MOVE:
+            # A position still waiting for the next frame is where the drag ended.
+            self.flush_move()
+            if self.move_origin is not None and self.prev_x is not None and self.prev_y is not None:
+                # The index is brought up to date once per drag rather than on every motion event.
+                dx = self.prev_x - self.move_origin[0]
+                dy = self.prev_y - self.move_origin[1]
+                self.spatial_index.move(self.move_tag, dx, dy)
+            self.move_tag = None
+            self.move_origin = None
+        elif self.mode == Mode.DRAW:
+            # Points still waiting for the next frame belong to this stroke and are added now.
+            self.flush_draw_queue()
+            line = self.current_stroke
+            if line is not None:
+                self.line_id_to_segments[line] = self.lines[line] = [line]
+                self.item_meta[line] = {'type': 'line', 'width': self.stroke_width, 'fill': "black"}
+                self.spatial_index.add_polyline(line, self.stroke_points, self.stroke_width / 2)
+            self.current_stroke = None
+            self.stroke_points = []
 
     def select_line(self, x: int, y: int) -> Optional[int]:
         """
@@ -352,12 +562,16 @@ class CanvasManager:
         :param y: The y-coordinate.
         :return: The ID of the selected line, or None if no line is found.
         """
-        items = self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1)
-        for item in items:
-            if item in self.line_id_to_segments:
-                print(f"select_line: item={item} found and selected, segments={self.line_id_to_segments[item]}")
-                return item
-        print("select_line: No item found")
+        items = [item for item in self.spatial_index.query_near(x, y, 1) if item in self.line_id_to_segments]
+        if len(items) > 1:
+            # Several objects are under the cursor, so Tk is asked for their stacking order and the topmost one,
+            # the one the user sees, is chosen.
+            items = [item for item in self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1) if item in items]
+        if items:
+            item = items[-1]
+            logger.debug("select_line: item=%s found and selected, segments=%s", item, self.line_id_to_segments[item])
+            return item
+        logger.debug("select_line: No item found")
         return None
 
     def Remove_continuous_line(self, line_id: int) -> None:
@@ -366,12 +580,8 @@ class CanvasManager:
 
         :param line_id: The ID of the line to remove.
         """
-        segments = self.line_id_to_segments.pop(line_id, None)
-        if segments is not None:
-            if segments in self.lines:
-                self.lines.remove(segments)
-            for segment in segments:
-                self.canvas.delete(segment)
+        # A line is a single canvas item, so it is removed like any other object.
+        self.remove_segment(line_id)
 
     def rotate_object(self, event: tk.Event) -> None:
         """
@@ -381,20 +591,14 @@ class CanvasManager:
         """
         item = self.canvas.find_closest(event.x, event.y)[0]
         if item:
-            angle = math.radians(90)
             item_type = self.canvas.type(item)
 
             if item_type == "line":
-                all_segments = self.line_id_to_segments.get(item, [])
-                for segment in all_segments:
-                    coords = self.canvas.coords(segment)
-                    if len(coords) % 4 == 0:
-                        new_coords = []
-                        for i in range(0, len(coords), 2):
-                            x, y = coords[i], coords[i + 1]
-                            new_x, new_y = self._rotate_point(x, y, event.x, event.y, angle)
-                            new_coords.extend([new_x, new_y])
-                        self.canvas.coords(segment, *new_coords)
+                coords = self.canvas.coords(item)
+                if len(coords) >= 4:
+                    new_coords = self._rotate_points(coords, event.x, event.y, QUARTER_TURN_COS, QUARTER_TURN_SIN)
+                    self.canvas.coords(item, *new_coords)
+                    self.spatial_index.update(item, new_coords)
 
             elif item_type in ["oval", "rectangle", "text"]:
                 # Rotation is not defined for ovals, rectangles, or text.
@@ -402,25 +606,29 @@ class CanvasManager:
 
             elif item_type == "polygon":
                 coords = self.canvas.coords(item)
-                centroid_x = sum(coords[::2]) / (len(coords) / 2)
+                centroid_x = sum(coords[0::2]) / (len(coords) / 2)
                 centroid_y = sum(coords[1::2]) / (len(coords) / 2)
-                new_coords = []
-                for i in range(0, len(coords), 2):
-                    new_x, new_y = self._rotate_point(coords[i], coords[i + 1], centroid_x, centroid_y, angle)
-                    new_coords.extend([new_x, new_y])
+                new_coords = self._rotate_points(coords, centroid_x, centroid_y, QUARTER_TURN_COS, QUARTER_TURN_SIN)
                 self.canvas.coords(item, *new_coords)
+                self.spatial_index.update(item, new_coords)
 
-    def _rotate_point(self, x: float, y: float, cx: float, cy: float, angle: float) -> Tuple[float, float]:
+    def _rotate_points(self, coords: List[float], cx: float, cy: float, cos_a: float, sin_a: float) -> List[float]:
         """
-        Calculates the new coordinates of a point after rotation around a given center.
+        Calculates the new coordinates of a flat list of points after rotation around a given center.
 
-        :param x: The original x-coordinate of the point.
-        :param y: The original y-coordinate of the point.
+        All points are transformed in one call, working on the x and y columns of the list, so rotating
+        an object costs a single call instead of one per vertex.
+
+        :param coords: The original coordinates as a flat [x0, y0, x1, y1, ...] list.
         :param cx: The x-coordinate of the center of rotation.
         :param cy: The y-coordinate of the center of rotation.
-        :param angle: The angle of rotation in radians.
-        :return: The new x and y coordinates after rotation.
-        """
-        new_x = cx + math.cos(angle) * (x - cx) - math.sin(angle) * (y - cy)
-        new_y = cy + math.sin(angle) * (x - cx) + math.cos(angle) * (y - cy)
-        return new_x, new_y
+        :param cos_a: The cosine of the rotation angle.
+        :param sin_a: The sine of the rotation angle.
+        :return: The rotated coordinates in the same flat layout.
+        """
+        xs = coords[0::2]
+        ys = coords[1::2]
+        new_coords = [0.0] * len(coords)
+        new_coords[0::2] = [cx + cos_a * (x - cx) - sin_a * (y - cy) for x, y in zip(xs, ys)]
+        new_coords[1::2] = [cy + sin_a * (x - cx) + cos_a * (y - cy) for x, y in zip(xs, ys)]
+        return new_coords
@@ -1,12 +1,16 @@
 import tkinter as tk
-from typing import Any, Callable, Optional
+import logging
+from typing import Any, Callable, Dict, Optional
+from Mode import Mode
+
+logger = logging.getLogger(__name__)
 
 
 class EventHandler:
     """
     Handles events on the canvas based on the current mode, coordinating between different managers.
     """
-    def __init__(self, canvas: tk.Canvas, mode: str, canvas_manager: Any, text_input: Callable, popup, settings_manager: Any, file_manager: Any) -> None:
+    def __init__(self, canvas: tk.Canvas, mode: Mode, canvas_manager: Any, text_input: Callable, popup, settings_manager: Any, file_manager: Any, selection: Any) -> None:
         """
         Initializes the event handler with the necessary components and settings.
 
@@ -14,19 +18,48 @@ class EventHandler:
         :param mode: The initial mode the application is set to.
         :param canvas_manager: The manager that handles drawing and object manipulation on the canvas.
         :param text_input: The function to handle text input events.
-        :param popup: The popup menu to be used for context actions.
+        :param popup: The popup menu to be used for context actions, or None until it is first needed.
         :param settings_manager: Manages application settings like tool configurations.
         :param file_manager: Manages file-related actions such as save, load, and export.
+        :param selection: The shared selection state holding the currently selected graphical object.
         """
         self.canvas: tk.Canvas = canvas
-        self.mode: str = mode
+        self.mode: Mode = mode
         self.canvas_manager: Any = canvas_manager
         self.text_input: Callable = text_input
-        self.popup: tk.Menu = popup
+        self.popup: Optional[tk.Menu] = popup
+        # Mouse events managed per mode; any of them missing from a mode's bindings is unbound.
+        self.mouse_events = ("<Button-1>", "<B1-Motion>", "<ButtonRelease-1>", "<Double-1>")
+        self.mode_bindings: Dict[Mode, Dict[str, Callable]] = {
+            # Motion is bound straight to the per-mode handler, so no mode check runs on every event.
+            Mode.DRAW: {"<Button-1>": canvas_manager.on_mouse_down,
+                     "<B1-Motion>": canvas_manager.on_draw_motion,
+                     "<ButtonRelease-1>": canvas_manager.on_mouse_release},
+            Mode.MOVE: {"<Button-1>": canvas_manager.on_mouse_down,
+                     "<B1-Motion>": canvas_manager.on_move_motion,
+                     "<ButtonRelease-1>": canvas_manager.on_mouse_release},
+            Mode.CIRCLE: {"<Button-1>": canvas_manager.start_circle,
+                       "<B1-Motion>": canvas_manager.draw_circle,
+                       "<ButtonRelease-1>": canvas_manager.finish_circle},
+            Mode.RECTANGLE: {"<Button-1>": canvas_manager.start_rectangle,
+                          "<B1-Motion>": canvas_manager.draw_rectangle,
+                          "<ButtonRelease-1>": canvas_manager.finish_rectangle},
+            Mode.TRIANGLE: {"<Button-1>": canvas_manager.start_triangle,
+                         "<B1-Motion>": canvas_manager.draw_triangle,
+                         "<ButtonRelease-1>": canvas_manager.finish_triangle},
+            Mode.POLYGON: {"<Button-1>": canvas_manager.add_polygon_point,
+                        "<Double-1>": canvas_manager.finish_polygon},
+            Mode.ERASER: {"<B1-Motion>": canvas_manager.eraser},
+            Mode.TEXT: {"<Button-1>": text_input},
+            Mode.COPY: {"<Button-1>": self.copy_selected_object},
+            Mode.PASTE: {"<Button-1>": self.paste_copied_object},
+            Mode.ROTATE: {"<Button-1>": self.rotate_object},
+        }
+        self.last_bound_mode: Optional[Mode] = None
         self.update_mouse_events()
         self.settings_manager: Any = settings_manager
         self.file_manager: Any = file_manager
-        self.selected_line_id: Optional[int] = None
+        self.selection: Any = selection
         self.prev_x: Optional[int] = None
         self.prev_y: Optional[int] = None
 
@@ -34,50 +67,26 @@ class EventHandler:
     def update_mouse_events(self) -> None:
         """
         Updates the mouse event bindings based on the current mode.
+
+        Nothing is rebound when the mode has not changed since the last call.
         """
-        self.canvas.unbind("<Button-1>")
-        self.canvas.unbind("<B1-Motion>")
-        self.canvas.unbind("<ButtonRelease-1>")
-
-        if self.mode == "draw":
-            self.canvas.bind("<Button-1>", self.canvas_manager.on_mouse_down)
-            self.canvas.bind("<B1-Motion>", self.canvas_manager.on_mouse_move)
-            self.canvas.bind("<ButtonRelease-1>", self.canvas_manager.on_mouse_release)
-        elif self.mode == "move":
-            self.canvas.bind("<Button-1>", self.canvas_manager.on_mouse_down)
-            self.canvas.bind("<B1-Motion>", self.canvas_manager.on_mouse_move)
-            self.canvas.bind("<ButtonRelease-1>", self.canvas_manager.on_mouse_release)
-        elif self.mode == "circle":
-            self.canvas.bind("<Button-1>", self.canvas_manager.start_circle)
-            self.canvas.bind("<B1-Motion>", self.canvas_manager.draw_circle)
-            self.canvas.bind("<ButtonRelease-1>", self.canvas_manager.finish_circle)
-        elif self.mode == "rectangle":
-            self.canvas.bind("<Button-1>", self.canvas_manager.start_rectangle)
-            self.canvas.bind("<B1-Motion>", self.canvas_manager.draw_rectangle)
-            self.canvas.bind("<ButtonRelease-1>", self.canvas_manager.finish_rectangle)
-        elif self.mode == "triangle":
-            self.canvas.bind("<Button-1>", self.canvas_manager.start_triangle)
-            self.canvas.bind("<B1-Motion>", self.canvas_manager.draw_triangle)
-            self.canvas.bind("<ButtonRelease-1>", self.canvas_manager.finish_triangle)
-        elif self.mode == "polygon":
-            self.canvas.bind("<Button-1>", self.canvas_manager.add_polygon_point)
-            self.canvas.bind("<Double-1>", self.canvas_manager.finish_polygon)
-        elif self.mode == "Remove":
-            self.canvas.bind("<Button-1>", self.canvas_manager.on_mouse_down)
-        elif self.mode == "eraser":
-            self.canvas.bind("<B1-Motion>", self.canvas_manager.eraser)
-        elif self.mode == "text":
-            self.canvas.bind("<Button-1>", self.text_input)
-            print("Text input function is bound to canvas click.")
-        elif self.mode == "copy":
-            self.canvas.bind("<Button-1>", self.copy_selected_object)
-        elif self.mode == "paste":
-            self.canvas.bind("<Button-1>", self.paste_copied_object)
-        # If no valid mode is set, ensure no events are bound
+        if self.mode == self.last_bound_mode:
+            return
+        bindings = self.mode_bindings.get(self.mode, {})
+        for event_name in self.mouse_events:
+            callback = bindings.get(event_name)
+            if callback is not None:
+                self.canvas.bind(event_name, callback)
+            else:
+                self.canvas.unbind(event_name)
+        if self.mode in (Mode.MOVE, Mode.REMOVE):
+            # Tk hit-tests the click itself and only calls on_stroke_press when a stroke is under the cursor.
+            self.canvas.tag_bind("stroke", "<Button-1>", self.canvas_manager.on_stroke_press)
         else:
-            self.canvas.unbind("<Button-1>")
-            self.canvas.unbind("<B1-Motion>")
-            self.canvas.unbind("<ButtonRelease-1>")
+            self.canvas.tag_unbind("stroke", "<Button-1>")
+        if self.mode == Mode.TEXT:
+            logger.debug("Text input function is bound to canvas click.")
+        self.last_bound_mode = self.mode
 
     def popup_menu(self, event: tk.Event) -> None:
         """
@@ -85,13 +94,10 @@ class EventHandler:
 
         :param event: The mouse event that triggered the popup.
         """
-        self.selected_line_id = self.canvas_manager.select_line(event.x, event.y)
-        if self.selected_line_id:
-            self.settings_manager.selected_line_id = self.selected_line_id
-            self.canvas_manager.selected_line_id = self.selected_line_id
+        selected_line_id = self.canvas_manager.select_line(event.x, event.y)
+        if selected_line_id is not None and self.popup is not None:
+            self.selection.current = selected_line_id
             self.popup.post(event.x_root, event.y_root)
-        else:
-            self.selected_line_id = None
 
     def set_start_position(self, event: tk.Event) -> None:
         """
@@ -1,8 +1,32 @@
-from tkinter import filedialog
-from PIL import Image, ImageGrab
+from tkinter import filedialog, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
+import gzip
+import itertools
 import json
-import tkinter.font as font
-from typing import List, Dict, Optional, Any, Tuple, Callable
+import logging
+import math
+import os
+from queue import SimpleQueue
+import re
+import zlib
+from typing import List, Dict, Optional, Any, Tuple, Callable, Iterator, TextIO
+from TextManager import get_font
+
+logger = logging.getLogger(__name__)
+
+# The first bytes of every gzip stream, used to recognize compressed drawings whatever their file name.
+GZIP_MAGIC = b'\x1f\x8b'
+DRAWING_FILE_TYPES = [('JSON files', '*.json'), ('Compressed JSON files', '*.json.gz')]
+OBJECT_TYPES = ('line', 'oval', 'rectangle', 'polygon', 'text')
+
+# How often, while a file is being written in the background, the Tk thread checks for failed writes to report.
+WRITE_CHECK_MS = 100
+
+# How many loaded objects are created on the canvas by each Tcl script.
+LOAD_BATCH_SIZE = 512
+
+# Colors that can be written into a Tcl script between braces without any risk of escaping them.
+SAFE_COLOR = re.compile(r'[\w# ]*')
 
 
 class FileManager:
@@ -10,20 +34,47 @@ class FileManager:
     Manages file operations such as save, load, export, copy, and paste for the graphical objects on the canvas.
     """
 
-    def __init__(self, canvas, line_id_to_segments: Dict[int, List[int]], lines: List[List[int]], settings_manager: Any) -> None:
+    def __init__(self, canvas, line_id_to_segments: Dict[int, List[int]], lines: Dict[int, List[int]], settings_manager: Any, spatial_index: Any,
+                 item_meta: Dict[int, Dict[str, Any]]) -> None:
         """
         Initializes the FileManager with the canvas and associated data structures.
 
-        :param canvas: The canvas object where the drawings are rendered.
-        :param line_id_to_segments: A dictionary mapping line IDs to their respective segments.
-        :param lines: A list of all lines drawn on the canvas.
+        :param canvas: The canvas object where the drawings are rendered, or None when files are only rendered
+                       headlessly with render_to_image.
+        :param line_id_to_segments: Every object on the canvas, mapping its item ID to a list holding that ID.
+        :param lines: All lines drawn on the canvas, keyed by their item ID.
         :param settings_manager: The manager for application settings.
+        :param spatial_index: Grid index of item positions used for hit-testing.
+        :param item_meta: Python-side mirror of each item's type and style options.
         """
         self.canvas = canvas
         self.line_id_to_segments: Dict[int, List[int]] = line_id_to_segments
-        self.lines: List[List[int]] = lines
+        self.lines: Dict[int, List[int]] = lines
         self.copied_object: Optional[Dict[str, Any]] = None
+        self.paster: Optional[Callable[[int, int], int]] = None
         self.settings_manager: Any = settings_manager
+        self.spatial_index: Any = spatial_index
+        self.item_meta: Dict[int, Dict[str, Any]] = item_meta
+        # The file last saved to or loaded from, and the bookkeeping that lets Save write only what changed:
+        # each object's key in that file, the fingerprint of what was last written for each key, and the
+        # source of keys for objects not yet in the file.
+        self.current_path: Optional[str] = None
+        self.file_keys: Dict[int, int] = {}
+        self.saved_fingerprints: Dict[int, int] = {}
+        self.key_counter = itertools.count()
+        # The keys of the saved objects in the stacking order the file and its journal reproduce on load.
+        self.saved_order: List[int] = []
+        # Whether the journal on disk extends the current file's snapshot, so Save can append to it; otherwise
+        # the next Save starts a new journal.
+        self.journal_matches = False
+        # Files are written by a single background thread, so the UI keeps responding during a save and the
+        # writes still happen in the order they were made. A failed write makes the next Save rewrite the file,
+        # and its message is queued for the Tk thread to show, since Tk may only be used from that thread.
+        self.writer = ThreadPoolExecutor(max_workers=1)
+        self.pending_write: Optional[Future] = None
+        self.write_failed = False
+        self.write_errors: SimpleQueue = SimpleQueue()
+        self.write_check_scheduled = False
 
 
 
@@ -40,71 +91,650 @@ class FileManager:
             y: int = self.canvas.winfo_rooty()
             x1: int = x + self.canvas.winfo_width()
             y1: int = y + self.canvas.winfo_height()
-            img = ImageGrab.grab().crop((x, y, x1, y1))
+            # Pillow is only needed here, so it is imported on first export instead of at startup.
+            from PIL import ImageGrab
+            # Only the canvas region is captured, rather than the whole screen followed by a crop.
+            img = ImageGrab.grab(bbox=(x, y, x1, y1))
             img.save(file_path)
 
+    def collect_objects(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Builds the saved form of every object on the canvas.
+
+        :return: The objects, keyed by the ID of their canvas item, in stacking order from the bottom up.
+        """
+        objects: Dict[int, Dict[str, Any]] = {}
+        # The mirror's lookup is bound once rather than on every iteration.
+        get_meta = self.item_meta.get
+        for item in self.canvas.find_all():
+            # Type and style come from the mirror rather than from Tk. Items without an entry are temporary
+            # previews and are not saved.
+            meta = get_meta(item)
+            if meta is None:
+                continue
+            objects[item] = dict(meta)
+        # The coordinates of every object are fetched together, filled in the order the objects were added.
+        for obj_data, coords in zip(objects.values(), self.items_coords(list(objects))):
+            obj_data['coords'] = coords
+        return objects
+
+    def encode_object(self, key: int, obj: Dict[str, Any]) -> str:
+        """
+        Serializes one object as it is stored in a drawing file or its journal.
+
+        :param key: The object's key within the file.
+        :param obj: The object's saved form.
+        :return: The compact JSON text of the object, with its key under 'id'.
+        """
+        # json.dumps without indent runs in the C encoder.
+        return json.dumps({'id': key, **obj}, separators=(',', ':'))
+
+    def journal_path(self, file_path: str) -> str:
+        """
+        Returns the path of the journal that records changes made to a drawing file since it was last compacted.
+
+        :param file_path: The path of the drawing file.
+        :return: The path of its journal.
+        """
+        return file_path + '.wal'
+
     def save_drawing(self) -> None:
         """
-        Saves the current drawing to a JSON file, which includes all graphical objects.
+        Saves the drawing to the file it was last saved to or loaded from, asking for a file the first time.
+
+        Only the objects that changed since the last save are written, appended to the file's journal as one
+        JSON line each; the drawing file itself is left untouched until the next Save As. When the stacking order
+        differs from the one replaying the journal would give, the order is journaled too. The journal starts with
+        a header naming the snapshot it extends, so a journal left behind by an interrupted Save As is ignored.
+        """
+        if self.current_path is None:
+            self.save_drawing_as()
+            return
+        if self.write_failed:
+            # The journal may be missing records from the failed write, so the whole drawing is written again.
+            self.compact()
+            return
+        objects = self.collect_objects()
+        records: List[str] = []
+        fingerprints: Dict[int, int] = {}
+        file_keys: Dict[int, int] = {}
+        get_key = self.file_keys.get
+        get_saved = self.saved_fingerprints.get
+        encode_object = self.encode_object
+        key_counter = self.key_counter
+        add_record = records.append
+        for item_id, obj in objects.items():
+            key = get_key(item_id)
+            if key is None:
+                key = next(key_counter)
+            file_keys[item_id] = key
+            text = encode_object(key, obj)
+            fingerprint = fingerprints[key] = hash(text)
+            if get_saved(key) != fingerprint:
+                add_record(text)
+        for key in self.saved_fingerprints.keys() - fingerprints.keys():
+            records.append(json.dumps({'id': key, 'deleted': True}, separators=(',', ':')))
+        # Replaying keeps the saved objects in their saved order and adds new ones on top, in the order their
+        # records were written. Anything else, such as a layer change or a piece split off an erased line, needs
+        # the order itself recorded.
+        order = list(fingerprints)
+        saved_keys = set(self.saved_order)
+        replayed_order = ([key for key in self.saved_order if key in fingerprints]
+                          + [key for key in order if key not in saved_keys])
+        if order != replayed_order:
+            records.append(json.dumps({'order': order}, separators=(',', ':')))
+        if records:
+            write = self.append_journal if self.journal_matches else self.start_journal
+            self.submit_write(write, self.current_path, '\n'.join(records) + '\n')
+            self.journal_matches = True
+        self.file_keys = file_keys
+        self.saved_fingerprints = fingerprints
+        self.saved_order = order
+
+    def save_drawing_as(self) -> None:
+        """
+        Asks for a file and saves the whole drawing to it as a JSON array of objects, gzip-compressed if the file
+        name ends in '.gz'.
         """
-        file_path: str = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[('JSON files', '*.json')],
+        file_path: str = filedialog.asksaveasfilename(defaultextension='.json', filetypes=DRAWING_FILE_TYPES,
                                                  title="Save drawing as...")
         if file_path:
-            objects: List[Dict[str, Any]] = []
-            for line_segments in self.lines:
-                line_data = {'type': 'line', 'coords': [], 'width': self.canvas.itemcget(line_segments[0], 'width'),
-                             'fill': self.canvas.itemcget(line_segments[0], 'fill')}
-                for segment in line_segments:
-                    line_data['coords'].extend(self.canvas.coords(segment))
-                objects.append(line_data)
-            for item in self.canvas.find_all():
-                obj_type = self.canvas.type(item)
-                if obj_type not in ['line']:
-                    obj_data = {
-                        'type': obj_type,
-                        'coords': self.canvas.coords(item),
-                        'width': self.canvas.itemcget(item, 'width'),
-                        'fill': self.canvas.itemcget(item, 'fill')
-                    }
-                    if obj_type in ['oval', 'rectangle', 'polygon']:
-                        obj_data['outline'] = self.canvas.itemcget(item, 'outline')
-                    elif obj_type == 'text':
-                        obj_data['text'] = self.canvas.itemcget(item, 'text')
-                        font_info = self.canvas.itemcget(item, 'font')
-                        if font_info:
-                            font_obj = font.Font(font=font_info)
-                            obj_data['font'] = {'family': font_obj.actual()['family'],
-                                                'size': font_obj.actual()['size']}
-                    objects.append(obj_data)
-            with open(file_path, 'w') as f:
-                json.dump(objects, f, indent=4)
+            self.current_path = file_path
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrites the current drawing file with the whole drawing and starts it a new, empty journal.
+
+        The objects are read from the canvas here; compressing and writing them is left to the writer thread.
+        """
+        if self.current_path is None:
+            return
+        objects = self.collect_objects()
+        texts = [self.encode_object(item_id, obj) for item_id, obj in objects.items()]
+        self.submit_write(self.write_snapshot, self.current_path, '[' + ','.join(texts) + ']')
+        self.file_keys = {item_id: item_id for item_id in objects}
+        self.saved_fingerprints = {item_id: hash(text) for item_id, text in zip(objects, texts)}
+        self.key_counter = itertools.count(max(objects, default=0) + 1)
+        self.saved_order = list(objects)
+        self.journal_matches = True
+
+    def submit_write(self, write: Callable[[str, str], None], path: str, text: str) -> None:
+        """
+        Queues a file write on the writer thread, after every write queued before it.
+
+        :param write: The method that performs the write.
+        :param path: The file to write.
+        :param text: The text to write to it.
+        """
+        self.pending_write = self.writer.submit(self.run_write, write, path, text)
+        if not self.write_check_scheduled:
+            self.write_check_scheduled = True
+            self.canvas.after(WRITE_CHECK_MS, self.check_writes)
+
+    def run_write(self, write: Callable[[str, str], None], path: str, text: str) -> None:
+        """
+        Performs a queued write on the writer thread, recording whether it succeeded.
+
+        A full snapshot clears an earlier failure, since it leaves the file complete. Any error is caught, as
+        there is no caller left to raise it to; it is logged and queued for check_writes to report.
+
+        :param write: The method that performs the write.
+        :param path: The file to write.
+        :param text: The text to write to it.
+        """
+        try:
+            write(path, text)
+        except Exception as error:
+            logger.exception("Could not write %s", path)
+            self.write_failed = True
+            self.write_errors.put(f"{path}: {error}")
+            return
+        if write == self.write_snapshot:
+            self.write_failed = False
+
+    def wait_for_writes(self) -> None:
+        """
+        Blocks until every queued write has finished, so files are not read while they are still being written.
+        """
+        if self.pending_write is not None:
+            self.pending_write.result()
+            self.pending_write = None
+
+    def check_writes(self) -> None:
+        """
+        Reports failed writes on the Tk thread, checking again later while a write is still in progress.
+        """
+        self.write_check_scheduled = False
+        # Whether the writes are done is read before reporting, so an error queued by a write finishing in between
+        # is reported on the next check rather than missed.
+        writing = self.pending_write is not None and not self.pending_write.done()
+        self.report_write_errors()
+        if writing:
+            self.write_check_scheduled = True
+            self.canvas.after(WRITE_CHECK_MS, self.check_writes)
+
+    def finish_writes(self) -> None:
+        """
+        Waits for every queued write and reports any that failed, used before the editor closes.
+        """
+        self.wait_for_writes()
+        self.report_write_errors()
+
+    def report_write_errors(self) -> None:
+        """
+        Shows the user the writes that failed since the last report, if any.
+        """
+        messages: List[str] = []
+        while not self.write_errors.empty():
+            messages.append(self.write_errors.get())
+        if messages:
+            messagebox.showerror("Save failed", "The drawing could not be saved:\n" + "\n".join(messages)
+                                 + "\n\nThe next Save will write the whole drawing again.")
+
+    def append_journal(self, file_path: str, text: str) -> None:
+        """
+        Appends records to a drawing's journal.
+
+        :param file_path: The path of the drawing file.
+        :param text: The records, one JSON line each.
+        """
+        with open(self.journal_path(file_path), 'ab') as f:
+            f.write(text.encode('utf-8'))
+
+    def start_journal(self, file_path: str, text: str) -> None:
+        """
+        Replaces a drawing's journal with a new one that extends the snapshot now on disk.
+
+        :param file_path: The path of the drawing file.
+        :param text: The first records of the new journal, one JSON line each.
+        """
+        self.replace_journal(file_path, self.file_crc(file_path), text)
+
+    def replace_journal(self, file_path: str, snapshot_crc: int, text: str) -> None:
+        """
+        Atomically replaces a drawing's journal with a header naming its snapshot, followed by the given records.
+
+        :param file_path: The path of the drawing file.
+        :param snapshot_crc: The CRC-32 of the snapshot file the journal extends.
+        :param text: The records that follow the header, one JSON line each.
+        """
+        journal_path = self.journal_path(file_path)
+        temp_path = journal_path + '.tmp'
+        header = json.dumps({'snapshot': snapshot_crc}, separators=(',', ':'))
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write((header + '\n' + text).encode('utf-8'))
+            os.replace(temp_path, journal_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def file_crc(self, file_path: str) -> int:
+        """
+        Calculates the CRC-32 of a file's bytes as stored on disk.
+
+        :param file_path: The path of the file.
+        :return: The checksum.
+        """
+        crc = 0
+        with open(file_path, 'rb') as f:
+            chunk = f.read(1 << 16)
+            while chunk:
+                crc = zlib.crc32(chunk, crc)
+                chunk = f.read(1 << 16)
+        return crc
+
+    def write_snapshot(self, file_path: str, text: str) -> None:
+        """
+        Replaces a drawing file with a new snapshot of the whole drawing and starts it a new, empty journal.
+
+        :param file_path: The path of the drawing file.
+        :param text: The drawing as a JSON array of objects.
+        """
+        # The document is encoded once and written in binary mode, skipping the text layer's own pass.
+        data = text.encode('utf-8')
+        if file_path.endswith('.gz'):
+            # The lowest level already removes most of the repetition in the coordinates and keys,
+            # at a fraction of the default level's CPU time.
+            data = gzip.compress(data, compresslevel=1)
+        # The new snapshot is written next to the file and renamed over it, so a failed write leaves the
+        # previous file and its journal untouched.
+        temp_path = file_path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, file_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        # The journal is only replaced once the new snapshot is in place. Should that not happen, the previous
+        # journal's header still names the previous snapshot, so loading ignores it rather than replaying its
+        # records onto keys that no longer match.
+        self.replace_journal(file_path, zlib.crc32(data), '')
 
     def load_drawing(self) -> None:
         """
-        Loads a drawing from a JSON file and recreates the graphical objects on the canvas.
+        Loads a drawing from a JSON file, applies its journal if it has one, and recreates the graphical objects
+        on the canvas.
         """
-        file_path: str = filedialog.askopenfilename(filetypes=[('JSON files', '*.json')], title="Load drawing")
+        file_path: str = filedialog.askopenfilename(filetypes=DRAWING_FILE_TYPES, title="Load drawing")
         if file_path:
-            with open(file_path, 'r') as f:
-                objects: List[Dict[str, Any]] = json.load(f)
+            self.wait_for_writes()
+            # The whole drawing is parsed and checked before anything is cleared, so a malformed file raises here
+            # and leaves the current drawing and its save bookkeeping untouched.
+            journal = self.read_journal(file_path)
+            with self.open_drawing(file_path) as f:
+                objects = list(self.drawing_objects(f, journal))
+            for key, obj in objects:
+                self.check_object(key, obj)
+
             self.canvas.delete("all")
             self.line_id_to_segments.clear()
+            self.lines.clear()
+            self.item_meta.clear()
+            self.spatial_index.clear()
+            self.file_keys = {}
+            self.saved_fingerprints = {}
+            last_key = max((key for key, _ in objects), default=-1)
+            for start in range(0, len(objects), LOAD_BATCH_SIZE):
+                self.create_batch(objects[start:start + LOAD_BATCH_SIZE])
+            self.current_path = file_path
+            self.key_counter = itertools.count(last_key + 1)
+            self.saved_order = [key for key, _ in objects]
+            self.journal_matches = journal is not None
+
+    def drawing_objects(self, f: TextIO,
+                        journal: Optional[List[Dict[str, Any]]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Reads the objects of a drawing file with its journal applied.
+
+        :param f: The open drawing file.
+        :param journal: The records of the file's journal, as returned by read_journal.
+        :return: An iterator over (key, object) pairs, in file order.
+        """
+        objects = self.keyed_objects(self.read_objects(f))
+        if not journal:
+            return objects
+        # Journaled changes can touch any object, so the snapshot is gathered before replaying them.
+        snapshot = dict(objects)
+        for record in journal:
+            if 'order' in record:
+                # The objects are restacked in the recorded order; any the record does not name stay on top.
+                restacked = {key: snapshot.pop(key) for key in record['order'] if key in snapshot}
+                restacked.update(snapshot)
+                snapshot = restacked
+                continue
+            key = record.pop('id')
+            if record.get('deleted'):
+                snapshot.pop(key, None)
+            else:
+                snapshot[key] = record
+        return iter(snapshot.items())
+
+    def check_object(self, key: Any, obj: Dict[str, Any]) -> None:
+        """
+        Checks that a parsed object has every field its canvas item is created from.
+
+        :param key: The object's key within the file.
+        :param obj: The object's saved form.
+        :raises ValueError: If the object cannot be recreated.
+        """
+        try:
+            obj_type = obj['type']
+            coords = obj['coords']
+            valid = (isinstance(key, int) and obj_type in OBJECT_TYPES and isinstance(obj['fill'], str)
+                     and isinstance(coords, list) and len(coords) >= (2 if obj_type == 'text' else 4)
+                     and len(coords) % 2 == 0
+                     # JSON parsing accepts NaN and Infinity, which Tk would only reject once the canvas is cleared.
+                     and all(isinstance(value, (int, float)) and math.isfinite(value) for value in coords))
+            if valid and obj_type == 'text':
+                valid = isinstance(obj['text'], str) and isinstance(obj['font']['family'], str)
+                int(obj['font']['size'])
+            elif valid:
+                # Files written before the style mirror hold the width as the string Tk reported.
+                valid = math.isfinite(float(obj['width'])) and isinstance(obj.get('outline', ''), str)
+        except (KeyError, TypeError, ValueError):
+            valid = False
+        if not valid:
+            raise ValueError(f"Drawing object {key!r} cannot be recreated")
 
-            for obj in objects:
-                coords = obj['coords']
+    def render_to_image(self, file_path: str, out_path: str, width: int, height: int) -> None:
+        """
+        Draws a drawing file straight onto an image and saves it, without a Tk window or canvas.
+
+        :param file_path: The path of the drawing file.
+        :param out_path: The path of the image to write; its extension picks the image format.
+        :param width: The width of the image, in pixels.
+        :param height: The height of the image, in pixels.
+        """
+        from PIL import Image, ImageDraw, ImageFont
+        img = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(img)
+        fonts: Dict[Tuple[str, int], Any] = {}
+        journal = self.read_journal(file_path, trim=False)
+        with self.open_drawing(file_path) as f:
+            for _, obj in self.drawing_objects(f, journal):
+                coords = [float(value) for value in obj['coords']]
+                fill = obj['fill'] or None
+                line_width = round(float(obj.get('width', 1)))
                 if obj['type'] == 'line':
-                    line_id = self.canvas.create_line(coords, fill=obj['fill'], width=obj['width'])
-                    self.line_id_to_segments[line_id] = [line_id]
-                elif obj['type'] in ['oval', 'rectangle', 'polygon']:
-                    create_func = getattr(self.canvas, f'create_{obj["type"]}')
-                    shape_id = create_func(coords, outline=obj.get('outline', ''), fill=obj['fill'], width=obj['width'])
-                    self.line_id_to_segments[shape_id] = [shape_id]
+                    draw.line(coords, fill=fill, width=line_width, joint='curve')
+                elif obj['type'] in ['oval', 'rectangle']:
+                    # Tk accepts the two corners in any order; Pillow needs the top-left one first.
+                    box = [min(coords[0], coords[2]), min(coords[1], coords[3]),
+                           max(coords[0], coords[2]), max(coords[1], coords[3])]
+                    draw_box = draw.ellipse if obj['type'] == 'oval' else draw.rectangle
+                    draw_box(box, fill=fill, outline=obj.get('outline') or None, width=line_width)
+                elif obj['type'] == 'polygon':
+                    draw.polygon(coords, fill=fill, outline=obj.get('outline') or None, width=line_width)
                 elif obj['type'] == 'text':
-                    font_properties = (obj['font']['family'], int(obj['font']['size']))
-                    font_obj = font.Font(family=font_properties[0], size=font_properties[1])
-                    text_id = self.canvas.create_text(coords, text=obj['text'], font=font_obj, fill=obj['fill'])
-                    self.line_id_to_segments[text_id] = [text_id]
-                    self.settings_manager.text_fonts[text_id] = (obj['font']['family'], int(obj['font']['size']), obj['fill'])
+                    font_key = (obj['font']['family'], int(obj['font']['size']))
+                    font_obj = fonts.get(font_key)
+                    if font_obj is None:
+                        try:
+                            font_obj = ImageFont.truetype(*font_key)
+                        except OSError:
+                            # The family is not installed as a font file Pillow can find by name.
+                            font_obj = ImageFont.load_default(font_key[1])
+                        fonts[font_key] = font_obj
+                    # Tk centers text on its position by default.
+                    draw.text(coords[:2], obj['text'], fill=fill, font=font_obj, anchor='mm')
+        img.save(out_path)
+
+    def open_drawing(self, file_path: str) -> TextIO:
+        """
+        Opens a drawing file for reading as text, decompressing it on the fly if it is gzip-compressed.
+
+        :param file_path: The path of the drawing file.
+        :return: The opened file.
+        """
+        with open(file_path, 'rb') as f:
+            magic = f.read(len(GZIP_MAGIC))
+        if magic == GZIP_MAGIC:
+            return gzip.open(file_path, 'rt', encoding='utf-8')
+        return open(file_path, 'r', encoding='utf-8')
+
+    def keyed_objects(self, objects: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Pairs each object of a drawing file with its key, taking it out of the object.
+
+        Files written before objects carried an 'id' use each object's position in the file instead.
+
+        :param objects: The objects, in file order.
+        :return: An iterator over (key, object) pairs.
+        """
+        for position, obj in enumerate(objects):
+            yield obj.pop('id', position), obj
+
+    def read_journal(self, file_path: str, trim: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reads the change records of a drawing's journal.
+
+        Every record is written with its trailing newline, so anything after the last newline was cut short by an
+        interrupted save; it is ignored and, unless trim is False, trimmed from the file so that later records
+        start on a fresh line.
+
+        :param file_path: The path of the drawing file.
+        :param trim: Whether to cut a torn record off the file. Readers that never append to the journal, such as
+                     the image export, pass False so that they leave the file untouched.
+        :return: The records in the order they were written, or None if the file has no journal that extends its
+                 current snapshot.
+        """
+        journal_path = self.journal_path(file_path)
+        if not os.path.exists(journal_path):
+            return None
+        with open(journal_path, 'rb') as f:
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        if trim and end < len(data):
+            # The journal is only opened for writing when there is a torn record to trim, so a read-only journal
+            # still loads.
+            with open(journal_path, 'r+b') as f:
+                f.truncate(end)
+        records = [json.loads(line) for line in data[:end].decode('utf-8').splitlines()]
+        if not records:
+            return None
+        if isinstance(records[0], dict) and 'snapshot' in records[0]:
+            if records[0]['snapshot'] != self.file_crc(file_path):
+                # A Save As replaced the snapshot but was interrupted before it could replace the journal.
+                return None
+            records = records[1:]
+        for record in records:
+            if not isinstance(record, dict) or not ('id' in record or isinstance(record.get('order'), list)):
+                raise ValueError(f"Malformed journal record in {journal_path}")
+        return records
+
+    def create_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Creates the canvas items for a batch of loaded objects, in order, and records the file key of each.
+
+        Consecutive lines and shapes are created by a single Tcl script. Text, and any object whose values could
+        not be written into a script safely, is created through create_object, after the script for the objects
+        before it has run, so the stacking order of the file is kept.
+
+        :param batch: The (key, object) pairs, in file order.
+        """
+        path = str(self.canvas)
+        commands: List[str] = []
+        scripted: List[Tuple[int, Dict[str, Any]]] = []
+        for key, obj in batch:
+            command = self.create_command(path, obj)
+            if command is not None:
+                commands.append(command)
+                scripted.append((key, obj))
+                continue
+            self.create_scripted(commands, scripted)
+            commands, scripted = [], []
+            item_id = self.create_object(obj)
+            if item_id is not None:
+                self.record_loaded(item_id, key, obj)
+        self.create_scripted(commands, scripted)
+
+    def create_scripted(self, commands: List[str], scripted: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Runs the create commands of a run of objects as one Tcl script and registers the items it made.
+
+        :param commands: The create commands, as built by create_command.
+        :param scripted: The (key, object) pairs the commands were built from, in the same order.
+        """
+        if not commands:
+            return
+        item_ids = self.canvas.tk.splitlist(self.canvas.tk.eval('list ' + ' '.join(commands)))
+        for item_id, (key, obj) in zip(map(int, item_ids), scripted):
+            self.register_object(item_id, obj)
+            self.record_loaded(item_id, key, obj)
+
+    def create_command(self, path: str, obj: Dict[str, Any]) -> Optional[str]:
+        """
+        Builds the Tcl command that creates the canvas item of a line or shape.
+
+        Every value is checked before it is written into the command, so a drawing file cannot inject script.
+
+        :param path: The Tk path name of the canvas.
+        :param obj: The object's saved form.
+        :return: The command in brackets, or None for text and for objects that must be created through tkinter.
+        """
+        obj_type = obj['type']
+        if obj_type not in ('line', 'oval', 'rectangle', 'polygon'):
+            return None
+        fill = obj['fill']
+        outline = obj.get('outline', '')
+        if not (isinstance(fill, str) and isinstance(outline, str)
+                and SAFE_COLOR.fullmatch(fill) and SAFE_COLOR.fullmatch(outline)):
+            return None
+        try:
+            coords = ' '.join(repr(float(value)) for value in obj['coords'])
+            width = repr(float(obj['width']))
+        except (TypeError, ValueError):
+            return None
+        options = f'-fill {{{fill}}} -width {width}'
+        if obj_type != 'line':
+            options = f'-outline {{{outline}}} ' + options
+        return f'[{path} create {obj_type} {coords} {options} -tags stroke]'
+
+    def record_loaded(self, item_id: int, key: int, obj: Dict[str, Any]) -> None:
+        """
+        Records the file key of a loaded object and the fingerprint of what the file holds for it.
+
+        :param item_id: The ID of the object's canvas item.
+        :param key: The object's key within the file.
+        :param obj: The object's saved form.
+        """
+        self.file_keys[item_id] = key
+        self.saved_fingerprints[key] = hash(self.encode_object(key, obj))
+
+    def create_object(self, obj: Dict[str, Any]) -> Optional[int]:
+        """
+        Creates the canvas item for one saved object and registers it with the shared data structures.
+
+        :param obj: The object's saved form.
+        :return: The ID of the created item, or None if the object's type is not known.
+        """
+        coords = obj['coords']
+        if obj['type'] == 'line':
+            item_id = self.canvas.create_line(coords, fill=obj['fill'], width=obj['width'], tags="stroke")
+        elif obj['type'] in ['oval', 'rectangle', 'polygon']:
+            create_func = getattr(self.canvas, f'create_{obj["type"]}')
+            item_id = create_func(coords, outline=obj.get('outline', ''), fill=obj['fill'], width=obj['width'],
+                                  tags="stroke")
+        elif obj['type'] == 'text':
+            font_obj = get_font(obj['font']['family'], int(obj['font']['size']))
+            item_id = self.canvas.create_text(coords, text=obj['text'], font=font_obj, fill=obj['fill'], tags="stroke")
+        else:
+            return None
+        self.register_object(item_id, obj)
+        return item_id
+
+    def register_object(self, item_id: int, obj: Dict[str, Any]) -> None:
+        """
+        Registers the canvas item created for a saved object with the shared data structures.
+
+        :param item_id: The ID of the created item.
+        :param obj: The object's saved form.
+        """
+        coords = obj['coords']
+        self.line_id_to_segments[item_id] = [item_id]
+        if obj['type'] == 'line':
+            self.lines[item_id] = self.line_id_to_segments[item_id]
+            self.spatial_index.add_polyline(item_id, coords, float(obj['width']) / 2)
+            self.item_meta[item_id] = {'type': 'line', 'width': obj['width'], 'fill': obj['fill']}
+        elif obj['type'] == 'text':
+            self.spatial_index.add_shape(item_id, self.canvas.bbox(item_id))
+            self.item_meta[item_id] = {'type': 'text', 'width': obj.get('width', 0), 'fill': obj['fill'],
+                                       'text': obj['text'], 'font': obj['font']}
+        else:
+            self.spatial_index.add_shape(item_id, coords, obj['type'])
+            self.item_meta[item_id] = {'type': obj['type'], 'width': obj['width'], 'fill': obj['fill'],
+                                       'outline': obj.get('outline', '')}
+
+    def read_objects(self, f: TextIO) -> List[Dict[str, Any]]:
+        """
+        Parses the JSON array of objects a drawing file holds.
+
+        :param f: The open drawing file.
+        :return: The drawing's objects, in file order.
+        :raises ValueError: If the file is not a JSON array of objects.
+        """
+        objects = json.load(f)
+        if not isinstance(objects, list) or not all(isinstance(obj, dict) for obj in objects):
+            raise ValueError("A drawing file must hold a JSON array of objects")
+        return objects
+
+    def items_coords(self, items: List[int]) -> List[List[float]]:
+        """
+        Collects the coordinates of several canvas items, each as one flat list.
+
+        All the coords queries are sent to Tk as a single script, so the whole call costs one round-trip
+        instead of one per item.
+
+        :param items: The IDs of the canvas items.
+        :return: For each item, its coordinates as [x0, y0, x1, y1, ...].
+        """
+        if not items:
+            return []
+        path = str(self.canvas)
+        script = 'list ' + ' '.join(f'[{path} coords {item}]' for item in items)
+        splitlist = self.canvas.tk.splitlist
+        return [[float(value) for value in splitlist(group)] for group in splitlist(self.canvas.tk.eval(script))]
+
+    def offset_coords(self, coords: List[float], dx: float, dy: float) -> List[float]:
+        """
+        Shifts a flat list of points by the given offset.
+
+        The x and y columns of the list are shifted as two slices, so there is no per-coordinate parity check.
+
+        :param coords: The coordinates as a flat [x0, y0, x1, y1, ...] list.
+        :param dx: The horizontal offset.
+        :param dy: The vertical offset.
+        :return: The shifted coordinates in the same flat layout.
+        """
+        new_coords = [0.0] * len(coords)
+        new_coords[0::2] = [value + dx for value in coords[0::2]]
+        new_coords[1::2] = [value + dy for value in coords[1::2]]
+        return new_coords
 
     def copy_object(self, object_id: int):
         """
@@ -112,32 +742,77 @@ class FileManager:
 
         :param object_id: The ID of the object to copy.
         """
-        if object_id:
-            obj_type: str = self.canvas.type(object_id)
-            coords: List[float] = self.canvas.coords(object_id)
-            properties: Dict[str, Any] = {
-                'type': obj_type,
-                'coords': coords,
-                'width': self.canvas.itemcget(object_id, 'width'),
-                'fill': self.canvas.itemcget(object_id, 'fill')
-            }
-            if obj_type in ['oval', 'rectangle', 'polygon']:
-                properties['outline'] = self.canvas.itemcget(object_id, 'outline')
-            elif obj_type == 'text':
-                properties['text'] = self.canvas.itemcget(object_id, 'text')
-                font_info = self.canvas.itemcget(object_id, 'font')
-                if font_info:
-                    font_obj = font.Font(font=font_info)
-                    properties['font'] = {'family': font_obj.actual()['family'],
-                                          'size': font_obj.actual()['size']}
+        if object_id in self.item_meta:
+            properties: Dict[str, Any] = dict(self.item_meta[object_id])
+            properties['coords'] = self.canvas.coords(object_id)
             self.copied_object = properties
-            if obj_type == 'line':
-                all_related_segments = self.line_id_to_segments.get(object_id, [])
-                coords = []
-                for segment in all_related_segments:
-                    coords.extend(self.canvas.coords(segment))
-                properties['coords'] = coords
+            self.paster = self.make_paster(properties)
 
+    def make_paster(self, properties: Dict[str, Any]) -> Callable[[int, int], int]:
+        """
+        Builds the function that pastes a copied object, so the work that only depends on the object
+        (choosing the create function, resolving the font, normalizing the coordinates) is done once at copy
+        time rather than on every paste.
+
+        :param properties: The copied object's saved form.
+        :return: A function that creates a copy of the object at the given position and returns its item ID.
+        """
+        obj_type: str = properties['type']
+        fill = properties['fill']
+        width = properties['width']
+
+        if obj_type == 'text':
+            family, size = properties['font']['family'], int(properties['font']['size'])
+            font_obj = get_font(family, size)
+            text = properties['text']
+
+            def paste_text(x: int, y: int) -> int:
+                item_id = self.canvas.create_text(x, y, text=text, font=font_obj, fill=fill, tags="stroke")
+                self.line_id_to_segments[item_id] = [item_id]
+                self.spatial_index.add_shape(item_id, self.canvas.bbox(item_id))
+                return item_id
+            return paste_text
+
+        coords: List[float] = properties['coords']
+        if obj_type == 'line':
+            # Lines and polygons are placed by their first point, so their points are stored relative to it.
+            relative_coords = self.offset_coords(coords, -coords[0], -coords[1])
+            pad = float(width) / 2
+
+            def paste_line(x: int, y: int) -> int:
+                new_coords = self.offset_coords(relative_coords, x, y)
+                item_id = self.canvas.create_line(new_coords, fill=fill, width=width, tags="stroke")
+                self.line_id_to_segments[item_id] = self.lines[item_id] = [item_id]
+                self.spatial_index.add_polyline(item_id, new_coords, pad)
+                return item_id
+            return paste_line
+
+        if obj_type == 'polygon':
+            relative_coords = self.offset_coords(coords, -coords[0], -coords[1])
+            outline = properties.get('outline', '')
+
+            def paste_polygon(x: int, y: int) -> int:
+                new_coords = self.offset_coords(relative_coords, x, y)
+                item_id = self.canvas.create_polygon(new_coords, outline=outline, fill=fill, width=width,
+                                                     tags="stroke")
+                self.line_id_to_segments[item_id] = [item_id]
+                self.spatial_index.add_shape(item_id, new_coords, 'polygon')
+                return item_id
+            return paste_polygon
+
+        # Ovals and rectangles are centered on the paste position.
+        create_func: Callable = getattr(self.canvas, f'create_{obj_type}')
+        half_width: float = (coords[2] - coords[0]) / 2
+        half_height: float = (coords[3] - coords[1]) / 2
+        outline = properties['outline']
+
+        def paste_box(x: int, y: int) -> int:
+            new_coords = [x - half_width, y - half_height, x + half_width, y + half_height]
+            item_id = create_func(new_coords, outline=outline, fill=fill, width=width, tags="stroke")
+            self.line_id_to_segments[item_id] = [item_id]
+            self.spatial_index.add_shape(item_id, new_coords, obj_type)
+            return item_id
+        return paste_box
 
     def paste_object(self, x: int, y: int) -> None:
         """
@@ -146,44 +821,6 @@ class FileManager:
         :param x: The x-coordinate of the new location.
         :param y: The y-coordinate of the new location.
         """
-        if self.copied_object:
-            obj_type: str = self.copied_object['type']
-            create_func: Callable = getattr(self.canvas, f'create_{obj_type}')
-            new_coords: List[float] = []
-
-            if obj_type == 'text':
-                font_properties: Tuple[str, int] = (self.copied_object['font']['family'], int(self.copied_object['font']['size']))
-                font_obj = font.Font(family=font_properties[0], size=font_properties[1])
-                item_id = self.canvas.create_text(x, y, text=self.copied_object['text'],
-                                                  font=font_obj, fill=self.copied_object['fill'])
-                self.line_id_to_segments[item_id] = [item_id]
-                self.settings_manager.text_fonts[item_id] = (
-                font_properties[0], font_properties[1], self.copied_object['fill'])
-
-            elif obj_type in ['polygon', 'triangle']:
-                original_coords: List[float] = self.copied_object['coords']
-                coord_diff_x: float = x - original_coords[0]
-                coord_diff_y: float = y - original_coords[1]
-                new_coords = [coord + (coord_diff_x if i % 2 == 0 else coord_diff_y) for i, coord in
-                              enumerate(original_coords)]
-                item_id = create_func(new_coords, outline=self.copied_object.get('outline', ''),
-                                      fill=self.copied_object['fill'], width=self.copied_object['width'])
-
-            elif obj_type == 'line':
-                original_coords: List[float] = self.copied_object['coords']
-                dx: float = x - original_coords[0]
-                dy: float = y - original_coords[1]
-                for i in range(0, len(original_coords), 4):
-                    new_coords.extend([original_coords[i] + dx, original_coords[i+1] + dy, original_coords[i+2] + dx, original_coords[i+3] + dy])
-                item_id = create_func(new_coords, fill=self.copied_object['fill'], width=self.copied_object['width'])
-                self.line_id_to_segments[item_id] = [item_id]
-                self.lines.append([item_id])
-
-            else:
-                original_coords: List[float] = self.copied_object['coords']
-                width: float = original_coords[2] - original_coords[0]
-                height: float = original_coords[3] - original_coords[1]
-                new_coords = [x - width / 2, y - height / 2, x + width / 2, y + height / 2]
-                item_id = create_func(new_coords, outline=self.copied_object['outline'],
-                                      fill=self.copied_object['fill'], width=self.copied_object['width'])
-                self.line_id_to_segments[item_id] = [item_id]
+        if self.paster is not None and self.copied_object is not None:
+            item_id = self.paster(x, y)
+            self.item_meta[item_id] = {key: value for key, value in self.copied_object.items() if key != 'coords'}
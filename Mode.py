@@ -0,0 +1,20 @@
+from enum import IntEnum
+
+
+class Mode(IntEnum):
+    """
+    The tool modes of the editor. Each manager compares against these members instead of mode name strings,
+    so a misspelled mode raises an AttributeError when the line runs rather than silently matching nothing.
+    """
+    DRAW = 0
+    MOVE = 1
+    CIRCLE = 2
+    RECTANGLE = 3
+    TRIANGLE = 4
+    POLYGON = 5
+    ERASER = 6
+    TEXT = 7
+    COPY = 8
+    PASTE = 9
+    ROTATE = 10
+    REMOVE = 11
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class SelectionState:
+    """
+    Holds the currently selected graphical object, shared by reference between the managers so that a
+    selection made by one of them is seen by all the others.
+    """
+    current: Optional[int] = None
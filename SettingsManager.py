@@ -1,26 +1,28 @@
 import tkinter as tk
-from tkinter import font
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List
+from TextManager import get_font
 
 
 class SettingsManager:
     """
     Manages settings for graphical objects on the canvas, including line width, line color, and text fonts.
     """
-    def __init__(self, canvas: tk.Canvas, selected_line_id: Optional[int], line_id_to_segments: Dict[int, List[int]], text_fonts: Dict[int, Tuple[str, int, str]]):
+    def __init__(self, canvas: tk.Canvas, selection: Any, line_id_to_segments: Dict[int, List[int]], spatial_index: Any, item_meta: Dict[int, Dict[str, Any]]):
         """
         Initializes the settings manager with references to canvas components and configurations.
 
         :param canvas: The canvas object where the drawings are rendered.
-        :param selected_line_id: The ID of the currently selected graphical object.
-        :param line_id_to_segments: A dictionary mapping line IDs to their respective segments.
-        :param text_fonts: A dictionary storing font settings for text objects.
+        :param selection: The shared selection state holding the currently selected graphical object.
+        :param line_id_to_segments: Every object on the canvas, mapping its item ID to a list holding that ID.
+        :param spatial_index: Grid index of item positions used for hit-testing.
+        :param item_meta: Python-side mirror of each item's type and style options.
         """
         self.canvas: tk.Canvas = canvas
-        self.selected_line_id: Optional[int] = selected_line_id
+        self.selection: Any = selection
         self.line_id_to_segments: Dict[int, List[int]] = line_id_to_segments
-        self.text_fonts: Dict[int, Tuple[str, int, str]] = text_fonts
         self.current_line_width: int = 1
+        self.spatial_index: Any = spatial_index
+        self.item_meta: Dict[int, Dict[str, Any]] = item_meta
 
     def change_line_width(self, value: int) -> None:
         """
@@ -34,57 +36,39 @@ class SettingsManager:
         """
         Sets the line width or text font size based on the type of the selected object.
 
+        Nothing is sent to Tk when the object already has the requested width or size.
+
         :param width: The width or font size to set for the selected object.
         """
-        if self.selected_line_id:
-            item_type: str = self.canvas.type(self.selected_line_id)
+        selected_line_id = self.selection.current
+        if selected_line_id in self.item_meta:
+            meta = self.item_meta[selected_line_id]
+            item_type: str = meta['type']
             if item_type == "line":
-                for segment in self.line_id_to_segments[self.selected_line_id]:
-                    self.canvas.itemconfig(segment, width=width)
+                if meta['width'] == width:
+                    return
+                self.canvas.itemconfig(selected_line_id, width=width)
+                meta['width'] = width
+                self.spatial_index.set_pad(selected_line_id, width / 2)
             elif item_type == "text":
-                if self.selected_line_id in self.text_fonts:
-                    font_name, original_size, original_color = self.text_fonts[self.selected_line_id]
-                    new_size = width
-                    new_font = font.Font(family=font_name, size=new_size*8)
-                    self.canvas.itemconfig(self.selected_line_id, font=new_font)
-                    self.text_fonts[self.selected_line_id] = (font_name, new_size, original_color)
+                font_name = meta['font']['family']
+                new_size = width*8
+                if meta['font']['size'] == new_size:
+                    return
+                self.canvas.itemconfig(selected_line_id, font=get_font(font_name, new_size))
+                meta['font'] = {'family': font_name, 'size': new_size}
+                self.spatial_index.add_shape(selected_line_id, self.canvas.bbox(selected_line_id))
 
-    def set_line_color_black(self) -> None:
-        """
-        Sets the line color to black for the selected object.
+    def set_line_color(self, color: str) -> None:
         """
-        if self.selected_line_id:
-            for segment in self.line_id_to_segments[self.selected_line_id]:
-                self.canvas.itemconfig(segment, fill='black')
+        Sets the line color for the selected object.
 
-    def set_line_color_green(self) -> None:
-        """
-        Sets the line color to green for the selected object.
-        """
-        if self.selected_line_id:
-            for segment in self.line_id_to_segments[self.selected_line_id]:
-                self.canvas.itemconfig(segment, fill='green')
-
-    def set_line_color_red(self) -> None:
-        """
-        Sets the line color to red for the selected object.
-        """
-        if self.selected_line_id:
-            for segment in self.line_id_to_segments[self.selected_line_id]:
-                self.canvas.itemconfig(segment, fill='red')
-
-    def set_line_color_blue(self) -> None:
-        """
-        Sets the line color to blue for the selected object.
-        """
-        if self.selected_line_id:
-            for segment in self.line_id_to_segments[self.selected_line_id]:
-                self.canvas.itemconfig(segment, fill='blue')
-
-    def set_line_color_yellow(self) -> None:
-        """
-        Sets the line color to yellow for the selected object.
-        """
-        if self.selected_line_id:
-            for segment in self.line_id_to_segments[self.selected_line_id]:
-                self.canvas.itemconfig(segment, fill='yellow')
\ No newline at end of file
+        :param color: The Tk color name to apply, e.g. 'black' or 'red'.
+        """
+        selected_line_id = self.selection.current
+        meta = self.item_meta.get(selected_line_id)
+        # An object that already has the color needs no change.
+        if meta is None or meta.get('fill') == color:
+            return
+        self.canvas.itemconfig(selected_line_id, fill=color)
+        meta['fill'] = color
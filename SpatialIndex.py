@@ -0,0 +1,315 @@
+from array import array
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class SpatialIndex:
+    """
+    Indexes canvas items by the grid cells they cover, so that hit-tests only look at the items near
+    the cursor instead of asking the canvas to scan every item it holds.
+
+    Each item's points and boxes are kept as flat arrays of doubles rather than lists of float objects,
+    so the geometry of a drawing with many segments stays compact in memory. The grid only narrows the
+    search down; lines, ovals and polygons are then tested against their actual outline, so the empty
+    corners of their bounding boxes do not count as hits.
+    """
+    __slots__ = ('cell_size', 'cells', 'item_geometry', 'item_boxes', 'item_cells')
+
+    def __init__(self, cell_size: int = 32) -> None:
+        """
+        Initializes an empty index.
+
+        :param cell_size: The side length, in pixels, of each grid cell.
+        """
+        self.cell_size: int = cell_size
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.item_geometry: Dict[int, Tuple[array, float, str]] = {}
+        self.item_boxes: Dict[int, array] = {}
+        self.item_cells: Dict[int, Set[Tuple[int, int]]] = {}
+
+    def add_shape(self, item: int, coords: List[float], kind: str = 'rectangle') -> None:
+        """
+        Indexes an item by the bounding box of all of its coordinates (ovals, rectangles, polygons, text boxes).
+
+        :param item: The canvas item ID.
+        :param coords: The item's coordinates as a flat [x0, y0, x1, y1, ...] list, or its bounding box.
+        :param kind: The canvas item type; 'oval' and 'polygon' are hit-tested by their shape, anything else
+                     by its bounding box.
+        """
+        self.insert(item, coords, 0, kind)
+
+    def add_polyline(self, item: int, coords: List[float], pad: float = 0) -> None:
+        """
+        Indexes a line item by the bounding box of each of its segments, so long lines only occupy
+        the cells they actually pass through.
+
+        :param item: The canvas item ID.
+        :param coords: The line's points as a flat [x0, y0, x1, y1, ...] list.
+        :param pad: Extra margin around each segment, typically half the line width.
+        """
+        self.insert(item, coords, pad, 'line')
+
+    def set_pad(self, item: int, pad: float) -> None:
+        """
+        Changes the margin of an indexed line, used when its width changes.
+
+        :param item: The canvas item ID.
+        :param pad: The new margin around each segment.
+        """
+        geometry = self.item_geometry.get(item)
+        if geometry is not None:
+            coords, _, kind = geometry
+            self.insert(item, coords, pad, kind)
+
+    def update(self, item: int, coords: List[float]) -> None:
+        """
+        Re-indexes an indexed item at new coordinates, keeping its margin and kind.
+
+        :param item: The canvas item ID.
+        :param coords: The item's new coordinates as a flat [x0, y0, x1, y1, ...] list.
+        """
+        geometry = self.item_geometry.get(item)
+        if geometry is not None:
+            _, pad, kind = geometry
+            self.insert(item, coords, pad, kind)
+
+    def move(self, item: int, dx: float, dy: float) -> None:
+        """
+        Shifts an indexed item by the given offset, mirroring a canvas.move on it.
+
+        :param item: The canvas item ID.
+        :param dx: The horizontal offset.
+        :param dy: The vertical offset.
+        """
+        geometry = self.item_geometry.get(item)
+        if geometry is not None:
+            coords, pad, kind = geometry
+            moved = [0.0] * len(coords)
+            moved[0::2] = [value + dx for value in coords[0::2]]
+            moved[1::2] = [value + dy for value in coords[1::2]]
+            self.insert(item, moved, pad, kind)
+
+    def insert(self, item: int, coords: Sequence[float], pad: float, kind: str) -> None:
+        """
+        Indexes an item, replacing whatever was indexed for it before.
+
+        :param item: The canvas item ID.
+        :param coords: The item's coordinates as a flat [x0, y0, x1, y1, ...] list.
+        :param pad: Extra margin around each box.
+        :param kind: The canvas item type; lines are indexed by each segment separately rather than by their
+                     overall bounding box.
+        """
+        self.remove(item)
+        xs = coords[0::2]
+        ys = coords[1::2]
+        if kind == 'line' and len(xs) > 1:
+            boxes = [(min(x0, x1) - pad, min(y0, y1) - pad, max(x0, x1) + pad, max(y0, y1) + pad)
+                     for x0, y0, x1, y1 in zip(xs, ys, xs[1:], ys[1:])]
+        else:
+            boxes = [(min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)]
+        size = self.cell_size
+        item_cells = set()
+        flat_boxes = array('d')
+        for box in boxes:
+            flat_boxes.extend(box)
+            x0, y0, x1, y1 = box
+            for cx in range(int(x0 // size), int(x1 // size) + 1):
+                for cy in range(int(y0 // size), int(y1 // size) + 1):
+                    item_cells.add((cx, cy))
+        for cell in item_cells:
+            self.cells.setdefault(cell, set()).add(item)
+        self.item_geometry[item] = (array('d', coords), pad, kind)
+        self.item_boxes[item] = flat_boxes
+        self.item_cells[item] = item_cells
+
+    def remove(self, item: int) -> None:
+        """
+        Removes an item from the index, if it is indexed.
+
+        :param item: The canvas item ID.
+        """
+        item_cells = self.item_cells.pop(item, None)
+        if item_cells is None:
+            return
+        del self.item_boxes[item]
+        del self.item_geometry[item]
+        for cell in item_cells:
+            members = self.cells[cell]
+            members.discard(item)
+            if not members:
+                del self.cells[cell]
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Set[int]:
+        """
+        Finds the indexed items with a box overlapping the given rectangle.
+
+        :param x0: The left edge of the rectangle.
+        :param y0: The top edge of the rectangle.
+        :param x1: The right edge of the rectangle.
+        :param y1: The bottom edge of the rectangle.
+        :return: The IDs of the overlapping items.
+        """
+        size = self.cell_size
+        candidates: Set[int] = set()
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                members = self.cells.get((cx, cy))
+                if members:
+                    candidates |= members
+        found: Set[int] = set()
+        for item in candidates:
+            boxes = self.item_boxes[item]
+            if any(bx0 <= x1 and bx1 >= x0 and by0 <= y1 and by1 >= y0
+                   for bx0, by0, bx1, by1 in zip(boxes[0::4], boxes[1::4], boxes[2::4], boxes[3::4])):
+                found.add(item)
+        return found
+
+    def query_near(self, x: float, y: float, radius: float) -> Set[int]:
+        """
+        Finds the indexed items within the given distance of a point.
+
+        Lines are tested against each of their segments, widened by their margin; ovals and polygons against
+        their filled area; other items against their bounding box. Distances are compared squared, so no square
+        root is taken.
+
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :param radius: The largest distance at which an item counts as near.
+        :return: The IDs of the nearby items.
+        """
+        found: Set[int] = set()
+        for item in self.query(x - radius, y - radius, x + radius, y + radius):
+            coords, pad, kind = self.item_geometry[item]
+            if len(coords) < 4:
+                hit = True
+            elif kind == 'line':
+                hit = self.near_polyline(coords, x, y, radius + pad, False)
+            elif kind == 'polygon':
+                hit = self.inside_polygon(coords, x, y) or self.near_polyline(coords, x, y, radius, True)
+            elif kind == 'oval':
+                hit = self.near_oval(coords, x, y, radius)
+            else:
+                hit = True
+            if hit:
+                found.add(item)
+        return found
+
+    def near_polyline(self, coords: array, x: float, y: float, reach: float, closed: bool) -> bool:
+        """
+        Checks whether any segment of a polyline passes within the given distance of a point.
+
+        :param coords: The points as a flat [x0, y0, x1, y1, ...] array.
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :param reach: The largest distance at which a segment counts as near.
+        :param closed: Whether the last point is joined back to the first, as in a polygon.
+        :return: True if a segment is near the point.
+        """
+        reach_sq = reach * reach
+        xs = coords[0::2]
+        ys = coords[1::2]
+        if closed:
+            xs.append(xs[0])
+            ys.append(ys[0])
+        return any(self.segment_distance_sq(x, y, x0, y0, x1, y1) <= reach_sq
+                   for x0, y0, x1, y1 in zip(xs, ys, xs[1:], ys[1:]))
+
+    @staticmethod
+    def inside_polygon(coords: array, x: float, y: float) -> bool:
+        """
+        Checks whether a point lies inside a polygon, by the even-odd rule Tk fills polygons with.
+
+        :param coords: The polygon's vertices as a flat [x0, y0, x1, y1, ...] array.
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :return: True if the point is inside.
+        """
+        inside = False
+        xs = coords[0::2]
+        ys = coords[1::2]
+        x0, y0 = xs[-1], ys[-1]
+        for x1, y1 in zip(xs, ys):
+            # Count the edges crossed by a ray from the point towards +x.
+            if (y1 > y) != (y0 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+            x0, y0 = x1, y1
+        return inside
+
+    @staticmethod
+    def near_oval(coords: array, x: float, y: float, radius: float) -> bool:
+        """
+        Checks whether a point lies within the given distance of an oval, by testing it against the oval
+        grown by that distance along both axes.
+
+        :param coords: The oval's bounding box as [x0, y0, x1, y1].
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :param radius: The largest distance at which the oval counts as near.
+        :return: True if the oval is near the point.
+        """
+        x0, y0, x1, y1 = coords[0], coords[1], coords[2], coords[3]
+        half_width = abs(x1 - x0) / 2 + radius
+        half_height = abs(y1 - y0) / 2 + radius
+        if half_width <= 0 or half_height <= 0:
+            return False
+        dx = (x - (x0 + x1) / 2) / half_width
+        dy = (y - (y0 + y1) / 2) / half_height
+        return dx * dx + dy * dy <= 1
+
+    def segments_near(self, item: int, x: float, y: float, radius: float) -> List[int]:
+        """
+        Finds the segments of an indexed line that pass within the given distance of a point.
+
+        :param item: The canvas item ID of the line.
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :param radius: The largest distance at which a segment counts as near.
+        :return: The positions of the nearby segments within the line, in increasing order.
+        """
+        coords, pad, _ = self.item_geometry[item]
+        reach = radius + pad
+        reach_sq = reach * reach
+        xs = coords[0::2]
+        ys = coords[1::2]
+        return [index for index, (x0, y0, x1, y1) in enumerate(zip(xs, ys, xs[1:], ys[1:]))
+                if self.segment_distance_sq(x, y, x0, y0, x1, y1) <= reach_sq]
+
+    def points(self, item: int) -> array:
+        """
+        Returns the coordinates an item was indexed with.
+
+        :param item: The canvas item ID.
+        :return: The item's coordinates as a flat [x0, y0, x1, y1, ...] array.
+        """
+        return self.item_geometry[item][0]
+
+    @staticmethod
+    def segment_distance_sq(x: float, y: float, x0: float, y0: float, x1: float, y1: float) -> float:
+        """
+        Calculates the squared distance from a point to a line segment.
+
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :param x0: The x-coordinate of the segment's start.
+        :param y0: The y-coordinate of the segment's start.
+        :param x1: The x-coordinate of the segment's end.
+        :param y1: The y-coordinate of the segment's end.
+        :return: The squared distance.
+        """
+        dx = x1 - x0
+        dy = y1 - y0
+        length_sq = dx * dx + dy * dy
+        if length_sq:
+            t = ((x - x0) * dx + (y - y0) * dy) / length_sq
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            x0 += t * dx
+            y0 += t * dy
+        return (x - x0) * (x - x0) + (y - y0) * (y - y0)
+
+    def clear(self) -> None:
+        """
+        Removes every item from the index.
+        """
+        self.cells.clear()
+        self.item_geometry.clear()
+        self.item_boxes.clear()
+        self.item_cells.clear()
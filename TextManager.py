@@ -1,18 +1,40 @@
 import tkinter as tki
+import functools
 from tkinter import font, Toplevel, Entry, Scale, Button, OptionMenu, StringVar
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Any
+from Mode import Mode
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(family: str, size: int) -> font.Font:
+    """
+    Returns a Tk font for the given family and size, creating it only the first time it is asked for.
+
+    Text items with the same family and size share one named font instead of each registering its own
+    with Tk. Fonts are never reconfigured after creation, so sharing them is safe. The pool is unbounded:
+    there are only as many entries as family and size pairs in use, and evicting one would delete a Tcl
+    font that items may still reference only to create it again on the next request.
+
+    :param family: The font family name.
+    :param size: The font size in points.
+    :return: The shared font object.
+    """
+    return font.Font(family=family, size=size)
 
 
 class TextManager:
     """
     Manages text input and formatting options on the canvas.
     """
-    def __init__(self, root: tki.Canvas, line_id_to_segments: Dict[int, List[int]]) -> None:
+    def __init__(self, root: tki.Canvas, line_id_to_segments: Dict[int, List[int]], spatial_index: Any,
+                 item_meta: Dict[int, Dict[str, Any]]) -> None:
         """
-        Initializes the TextManager with the main application window and line segments dictionary.
+        Initializes the TextManager with the main application window and the object dictionary.
 
         :param root: The main application window.
-        :param line_id_to_segments: Dictionary to keep track of line segments associated with text.
+        :param line_id_to_segments: Every object on the canvas, mapping its item ID to a list holding that ID.
+        :param spatial_index: Grid index of item positions used for hit-testing.
+        :param item_meta: Python-side mirror of each item's type and style options.
         """
         self.text_window: Optional[Toplevel] = None
         self.text_entry: Optional[Entry] = None
@@ -24,8 +46,9 @@ class TextManager:
         self.original_font: Optional[Tuple[str, int, str]] = None
         self.canvas: tki.Canvas = root
         self.line_id_to_segments: Dict[int, List[int]] = line_id_to_segments
-        self.text_fonts: Dict[int, Tuple[str, int, str]] = {}
-        self.mode: str = "text"
+        self.spatial_index: Any = spatial_index
+        self.item_meta: Dict[int, Dict[str, Any]] = item_meta
+        self.mode: Mode = Mode.TEXT
 
     def text_input(self, event: tki.Event) -> None:
         """
@@ -33,7 +56,7 @@ class TextManager:
 
         :param event: The event triggering the text input dialog.
         """
-        if self.mode == "text":
+        if self.mode == Mode.TEXT:
             self.text_window = tki.Toplevel(self.canvas)
             self.text_window.title("Enter Text")
             self.text_entry = tki.Entry(self.text_window, width=20)
@@ -74,11 +97,13 @@ class TextManager:
         selected_size = int(self.font_size.get())
         selected_color = self.color_var.get()
         self.original_font = (selected_font, selected_size, selected_color)
-        text_font = font.Font(family=selected_font, size=selected_size)
-        text_id = self.canvas.create_text(x, y, text=user_text, font=text_font, fill=selected_color)
+        text_font = get_font(selected_font, selected_size)
+        text_id = self.canvas.create_text(x, y, text=user_text, font=text_font, fill=selected_color, tags="stroke")
         self.line_id_to_segments[text_id] = [text_id]
+        self.spatial_index.add_shape(text_id, self.canvas.bbox(text_id))
+        self.item_meta[text_id] = {'type': 'text', 'width': 0, 'fill': selected_color, 'text': user_text,
+                                   'font': {'family': selected_font, 'size': selected_size}}
         self.text_window.destroy()
-        self.text_fonts[text_id] = (selected_font, selected_size, selected_color)
 
 
 
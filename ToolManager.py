@@ -1,4 +1,5 @@
 from typing import Any
+from Mode import Mode
 
 
 class ToolManager:
@@ -17,11 +18,11 @@ class ToolManager:
         self.canvas_manager: Any = canvas_manager
         self.canvas = canvas
 
-    def set_mode(self, mode: str) -> None:
+    def set_mode(self, mode: Mode) -> None:
         """
         Sets the operational mode for tools and updates event handling accordingly.
 
-        :param mode: A string representing the mode to be set (e.g., 'circle', 'rectangle', 'eraser').
+        :param mode: The mode to be set (e.g., Mode.CIRCLE, Mode.RECTANGLE, Mode.ERASER).
         """
         self.event_handler.mode = mode
         self.canvas_manager.mode = mode
@@ -31,26 +32,27 @@ class ToolManager:
         """
         Activates the mode for drawing circles.
         """
-        self.set_mode("circle")
+        self.set_mode(Mode.CIRCLE)
 
     def enable_draw_rectangle(self) -> None:
         """
         Activates the mode for drawing rectangles.
         """
-        self.set_mode("rectangle")
+        self.set_mode(Mode.RECTANGLE)
 
     def enable_draw_triangle(self) -> None:
         """
         Activates the mode for drawing triangles.
         """
-        self.set_mode("triangle")
+        self.set_mode(Mode.TRIANGLE)
 
     def enable_draw_polygon(self) -> None:
         """
         Activates the mode for drawing polygons and initializes the polygon point list.
         """
         self.canvas_manager.polygon_points = []
-        self.set_mode("polygon")
+        self.canvas_manager.delete_polygon_lines()
+        self.set_mode(Mode.POLYGON)
 
     def enable_eraser(self, size: int) -> None:
         """
@@ -59,49 +61,46 @@ class ToolManager:
         :param size: The size of the eraser tool.
         """
         self.canvas_manager.eraser_size = size
-        self.set_mode("eraser")
+        self.set_mode(Mode.ERASER)
 
     def enable_draw(self) -> None:
         """
         Sets the mode to free-form drawing.
         """
-        self.set_mode("draw")
+        self.set_mode(Mode.DRAW)
 
     def enable_Remove(self) -> None:
         """
         Sets the mode to remove graphical objects from the canvas.
         """
-        self.set_mode("Remove")
+        self.set_mode(Mode.REMOVE)
 
     def enable_move(self) -> None:
         """
         Activates the move tool, allowing for the repositioning of graphical objects.
         """
-        self.set_mode("move")
+        self.set_mode(Mode.MOVE)
 
     def enable_text(self) -> None:
         """
         Activates the text tool, enabling text input on the canvas.
         """
-        self.set_mode("text")
-        self.event_handler.mode = "text"
-        self.canvas.bind("<Button-1>", self.event_handler.text_input)
+        self.set_mode(Mode.TEXT)
 
     def enable_copy(self) -> None:
         """
         Activates the copy tool to copy graphical objects.
         """
-        self.set_mode("copy")
+        self.set_mode(Mode.COPY)
 
     def enable_paste(self) -> None:
         """
         Activates the paste tool to paste copied graphical objects.
         """
-        self.set_mode("paste")
+        self.set_mode(Mode.PASTE)
 
     def enable_rotate(self) -> None:
         """
         Activates the rotate tool and sets up event handling for object rotation.
         """
-        self.set_mode("rotate")
-        self.canvas.bind("<Button-1>", self.event_handler.rotate_object)
+        self.set_mode(Mode.ROTATE)
@@ -1,6 +1,10 @@
 import tkinter as tk
 import tkinter.font as font
-from typing import Callable, Any
+from functools import partial
+from typing import Callable, Any, Optional
+
+# Colors offered in the popup menu, in menu order.
+POPUP_COLORS = ("Black", "Green", "Red", "Blue", "Yellow")
 
 
 class UIManager:
@@ -26,12 +30,12 @@ class UIManager:
         self.file_manager: Any = file_manager
         self.settings_manager: Any = settings_manager
         self.event_handler: Any = event_handler
+        self.popup: Optional[tk.Menu] = None
 
         self.root.configure(bg='#333')
         style_font: font.Font = font.Font(family="Helvetica", size=9, weight="bold")
         button_width: int = 20
         self.setup_buttons(style_font, button_width)
-        self.setup_popup_menu()
 
     def setup_buttons(self, style_font: font.Font, button_width: int) -> None:
         """
@@ -85,14 +89,12 @@ class UIManager:
 
         # File management tools
         self.create_button(file_frame, "Save", self.file_manager.save_drawing, style_font, button_width)
+        self.create_button(file_frame, "Save As", self.file_manager.save_drawing_as, style_font, button_width)
         self.create_button(file_frame, "Load", self.file_manager.load_drawing, style_font, button_width)
         self.create_button(file_frame, "Export", self.file_manager.export_canvas, style_font,button_width)
 
-        # Bind events
-        self.canvas.bind("<Button-1>", self.canvas_manager.on_mouse_move)
-        self.canvas.bind("<B1-Motion>", self.canvas_manager.on_mouse_move)
-        self.canvas.bind("<ButtonRelease-1>", self.canvas_manager.on_mouse_release)
-        self.canvas.bind("<Button-3>", self.event_handler.popup_menu)
+        # Bind events; the left-button bindings are managed by the event handler for the current mode.
+        self.canvas.bind("<Button-3>", self.show_popup_menu)
 
     def create_button(self, frame: tk.Frame, text: str, command: Callable, font: font.Font, width: int):
         """
@@ -110,6 +112,17 @@ class UIManager:
         button.pack(pady=5, padx=5, fill=tk.X)
         return button
 
+    def show_popup_menu(self, event: tk.Event) -> None:
+        """
+        Builds the popup menu on the first right-click and lets the event handler show it.
+
+        :param event: The mouse event that triggered the popup.
+        """
+        if self.popup is None:
+            self.setup_popup_menu()
+            self.event_handler.popup = self.popup
+        self.event_handler.popup_menu(event)
+
     def setup_popup_menu(self) -> None:
         """
         Sets up the popup menu for additional options and commands.
@@ -119,11 +132,9 @@ class UIManager:
         self.popup.add_command(label="Second Size", command=lambda: self.settings_manager.set_line_width(7))
         self.popup.add_command(label="Third Size", command=lambda: self.settings_manager.set_line_width(10))
         self.popup.add_separator()
-        self.popup.add_command(label="Black", command=lambda: self.settings_manager.set_line_color_black())
-        self.popup.add_command(label="Green", command=lambda: self.settings_manager.set_line_color_green())
-        self.popup.add_command(label="Red", command=lambda: self.settings_manager.set_line_color_red())
-        self.popup.add_command(label="Blue", command=lambda: self.settings_manager.set_line_color_blue())
-        self.popup.add_command(label="Yellow", command=lambda: self.settings_manager.set_line_color_yellow())
+        set_line_color = self.settings_manager.set_line_color
+        for color in POPUP_COLORS:
+            self.popup.add_command(label=color, command=partial(set_line_color, color.lower()))
         self.popup.add_separator()
         self.popup.add_command(label="Bring Forward", command=self.canvas_manager.move_forward)
         self.popup.add_command(label="Move Backward", command=self.canvas_manager.move_backward)
@@ -1,6 +1,6 @@
 import argparse
 import tkinter as tk
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Any, Tuple
 from CanvasManager import CanvasManager
 from ToolManager import ToolManager
 from UIManager import UIManager
@@ -8,11 +8,21 @@ from FileManager import FileManager
 from EventHandler import EventHandler
 from SettingsManager import SettingsManager
 from TextManager import TextManager
+from SpatialIndex import SpatialIndex
+from SelectionState import SelectionState
+from Mode import Mode
+
+CANVAS_WIDTH = 900
+CANVAS_HEIGHT = 400
 
 class MainApplication:
     """
     MainApplication initializes and manages the main components of the Vector Graphics Editor.
     """
+    __slots__ = ('root', 'canvas', 'text_input', 'line_id_to_segments', 'selection', 'lines', 'spatial_index',
+                 'item_meta', 'draw_queue', 'mode', 'text_manager', 'settings_manager', 'file_manager',
+                 'canvas_manager', 'event_handler', 'tool_manager', 'ui_manager')
+
     def __init__(self, root: tk.Tk) -> None:
         """
          Initialize the main application with necessary managers and configurations.
@@ -21,51 +31,70 @@ class MainApplication:
         self.root: tk.Tk = root
         self.root.title("Vector Graphics Editor")
         self.root.resizable(False, False)
-        self.canvas: tk.Canvas = tk.Canvas(root, width=900, height=400, bg="white")
-        self.canvas.pack(expand=True, fill=tk.BOTH)
+        self.canvas: tk.Canvas = tk.Canvas(root, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="white")
+        # The window cannot be resized, so there is no extra height to expand into. The toolbar below can still
+        # be wider than the canvas, and the canvas is stretched across it so no bars show at its sides.
+        self.canvas.pack(fill=tk.X)
         self.text_input: Any = TextManager.text_input
 
-        # Dictionary mapping line IDs to their segment data
+        # Every object on the canvas, mapping its item ID to a list holding that ID
         self.line_id_to_segments: Dict[int, List[int]] = {}
 
-        # Dictionary to store text font data
-        self.text_fonts: Dict[Any, Any] = {}
+        # Currently selected line ID, shared by every manager that reads or changes the selection
+        self.selection: SelectionState = SelectionState()
 
-        # Currently selected line ID
-        self.selected_line_id: Optional[int] = None
+        # Lines on the canvas, keyed by their item ID
+        self.lines: Dict[int, List[int]] = {}
 
-        # List of lines on the canvas
-        self.lines: List[List[int]] = []
+        # Grid index of item positions used for hit-testing
+        self.spatial_index: SpatialIndex = SpatialIndex()
 
+        # Type and style options of every item, mirrored so they can be read without querying Tk
+        self.item_meta: Dict[int, Dict[str, Any]] = {}
 
-        # Setup the popup menu.
-        self.popup: tk.Menu = tk.Menu(self.root, tearoff=0)
+        # Freehand points waiting to be added to the stroke being drawn at the next frame
+        self.draw_queue: List[Tuple[int, int]] = []
 
         # Set the default mode of the application to drawing.
-        self.mode = "draw"
+        self.mode: Mode = Mode.DRAW
 
         # Initialize all managers involved in the application.
-        self.text_manager = TextManager(self.canvas, self.line_id_to_segments)
-        self.settings_manager = SettingsManager(self.canvas,self.selected_line_id, self.line_id_to_segments, self.text_manager.text_fonts)
-        self.file_manager = FileManager(self.canvas, self.line_id_to_segments, self.lines,self.settings_manager)
-        self.canvas_manager = CanvasManager(self.canvas,self.line_id_to_segments,self.settings_manager,self.lines)
-        self.event_handler = EventHandler(self.canvas, self.mode, self.canvas_manager, self.text_manager.text_input, self.popup,self.settings_manager,self.file_manager)
+        self.text_manager = TextManager(self.canvas, self.line_id_to_segments, self.spatial_index, self.item_meta)
+        self.settings_manager = SettingsManager(self.canvas,self.selection, self.line_id_to_segments, self.spatial_index, self.item_meta)
+        self.file_manager = FileManager(self.canvas, self.line_id_to_segments, self.lines,self.settings_manager, self.spatial_index, self.item_meta)
+        self.canvas_manager = CanvasManager(self.canvas,self.line_id_to_segments,self.settings_manager,self.lines, self.spatial_index, self.item_meta, self.draw_queue, self.selection)
+        self.event_handler = EventHandler(self.canvas, self.mode, self.canvas_manager, self.text_manager.text_input, None,self.settings_manager,self.file_manager, self.selection)
         self.tool_manager = ToolManager(self.event_handler, self.canvas_manager, self.canvas)
+        # The canvas manager also needs the starting mode, or strokes drawn before any tool is picked are lost.
+        self.tool_manager.set_mode(self.mode)
 
 
-        # Initialize the user interface and link the popup menu.
+        # Initialize the user interface; it builds the popup menu on the first right-click.
         self.ui_manager: UIManager = UIManager(root, self.canvas, self.tool_manager, self.canvas_manager, self.file_manager,
                                     self.settings_manager, self.event_handler)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-        # Set the popup menu from UIManager to be used in the application
-        self.event_handler.popup = self.ui_manager.popup
+    def on_close(self) -> None:
+        """
+        Closes the editor once the saves still being written have finished, so a failed one is reported first.
+        """
+        self.file_manager.finish_writes()
+        self.root.destroy()
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Vector Graphics Editor: A simple tool for creating and manipulating vector graphics.")
+    parser.add_argument('--render', nargs=2, metavar=('DRAWING', 'IMAGE'),
+                        help="render a saved drawing to an image file without opening a window, then exit")
     args = parser.parse_args()  # This parses the command-line arguments
 
+    if args.render:
+        # Rendering only reads the drawing file, so none of the canvas-side structures are needed.
+        file_manager = FileManager(None, {}, {}, None, None, {})
+        file_manager.render_to_image(args.render[0], args.render[1], CANVAS_WIDTH, CANVAS_HEIGHT)
+        return
+
     root = tk.Tk()
     app = MainApplication(root)
     root.mainloop()
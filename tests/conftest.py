@@ -0,0 +1,76 @@
+import os
+import re
+import sys
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+# The modules live at the top of the repository rather than in a package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubTk:
+    """
+    Answers the Tcl scripts the managers batch their canvas queries into.
+    """
+    def __init__(self, canvas: 'StubCanvas') -> None:
+        self.canvas = canvas
+
+    def eval(self, script: str) -> str:
+        groups = re.findall(r'\[concat ((?:\[\S+ coords \d+\] ?)*)\]|\[\S+ coords (\d+)\]', script)
+        results = []
+        for group, single in groups:
+            items = re.findall(r'coords (\d+)', group) if group else [single]
+            results.append('{' + ' '.join(str(value) for item in items
+                                          for value in self.canvas.items[int(item)][1]) + '}')
+        return ' '.join(results)
+
+    def splitlist(self, value: Any) -> Tuple[str, ...]:
+        if isinstance(value, str):
+            return tuple(braced if braced or not bare else bare
+                         for braced, bare in re.findall(r'\{([^{}]*)\}|(\S+)', value))
+        return tuple(value)
+
+
+class StubCanvas:
+    """
+    Keeps canvas items and their stacking order in Python, for tests that run without a display.
+    """
+    def __init__(self) -> None:
+        self.items: Dict[int, Tuple[str, List[float]]] = {}
+        self.order: List[int] = []
+        self.next_id = 1
+        self.tk = StubTk(self)
+
+    def __str__(self) -> str:
+        return '.c'
+
+    def create(self, kind: str, coords: List[float]) -> int:
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = (kind, [float(value) for value in coords])
+        self.order.append(item)
+        return item
+
+    def find_all(self) -> Tuple[int, ...]:
+        return tuple(self.order)
+
+    def delete(self, item: int) -> None:
+        del self.items[item]
+        self.order.remove(item)
+
+    def tag_lower(self, item: int, below: Any = None) -> None:
+        self.order.remove(item)
+        self.order.insert(0, item)
+
+    def tag_raise(self, item: int, above: int) -> None:
+        self.order.remove(item)
+        self.order.insert(self.order.index(above) + 1, item)
+
+    def after(self, ms: int, callback: Any = None, *args: Any) -> str:
+        return 'after#0'
+
+
+@pytest.fixture
+def canvas() -> StubCanvas:
+    return StubCanvas()
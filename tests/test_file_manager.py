@@ -0,0 +1,190 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from FileManager import FileManager
+
+
+def add_object(file_manager: FileManager, kind: str, coords: List[float], fill: str = 'black') -> int:
+    """
+    Creates a stub canvas item and its style mirror entry, the way the managers register a new object.
+    """
+    item = file_manager.canvas.create(kind, coords)
+    file_manager.item_meta[item] = {'type': kind, 'width': 1, 'fill': fill}
+    return item
+
+
+def replay(file_manager: FileManager, path: str, trim: bool = True) -> List[Dict[str, Any]]:
+    """
+    Reads a drawing file back with its journal applied, in the order loading would stack the objects.
+    """
+    journal = file_manager.read_journal(path, trim)
+    with file_manager.open_drawing(path) as f:
+        return [obj for _, obj in file_manager.drawing_objects(f, journal)]
+
+
+def canvas_objects(file_manager: FileManager) -> List[Dict[str, Any]]:
+    return list(file_manager.collect_objects().values())
+
+
+@pytest.fixture
+def file_manager(canvas, tmp_path) -> FileManager:
+    file_manager = FileManager(canvas, {}, {}, None, None, {})
+    file_manager.current_path = str(tmp_path / 'drawing.json')
+    return file_manager
+
+
+def save(file_manager: FileManager) -> None:
+    file_manager.save_drawing()
+    file_manager.wait_for_writes()
+
+
+def test_save_after_compact_replays_changes(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    oval = add_object(file_manager, 'oval', [5, 5, 20, 20])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+
+    file_manager.canvas.items[oval][1][:] = [50, 50, 60, 60]
+    add_object(file_manager, 'rectangle', [1, 2, 3, 4])
+    save(file_manager)
+
+    assert replay(file_manager, file_manager.current_path) == canvas_objects(file_manager)
+
+
+def test_unchanged_drawing_writes_nothing(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+    journal_path = file_manager.journal_path(file_manager.current_path)
+    with open(journal_path, 'rb') as f:
+        before = f.read()
+
+    save(file_manager)
+
+    with open(journal_path, 'rb') as f:
+        assert f.read() == before
+
+
+def test_deleted_objects_are_not_replayed(file_manager):
+    line = add_object(file_manager, 'line', [0, 0, 10, 10])
+    add_object(file_manager, 'oval', [5, 5, 20, 20])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+
+    file_manager.canvas.delete(line)
+    del file_manager.item_meta[line]
+    save(file_manager)
+
+    assert [obj['type'] for obj in replay(file_manager, file_manager.current_path)] == ['oval']
+
+
+def test_layer_changes_are_replayed(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    oval = add_object(file_manager, 'oval', [5, 5, 20, 20])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+
+    file_manager.canvas.tag_lower(oval)
+    save(file_manager)
+
+    assert [obj['type'] for obj in replay(file_manager, file_manager.current_path)] == ['oval', 'line']
+
+
+def test_new_objects_keep_their_place_in_the_stack(file_manager):
+    line = add_object(file_manager, 'line', [0, 0, 10, 10])
+    add_object(file_manager, 'oval', [5, 5, 20, 20])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+
+    # A piece split off an erased line is stacked right above it, below the objects drawn after the line.
+    piece = add_object(file_manager, 'line', [20, 20, 30, 30])
+    file_manager.canvas.tag_raise(piece, line)
+    save(file_manager)
+
+    assert replay(file_manager, file_manager.current_path) == canvas_objects(file_manager)
+    assert [obj['type'] for obj in canvas_objects(file_manager)] == ['line', 'line', 'oval']
+
+
+def test_new_objects_on_top_need_no_order_record(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+
+    add_object(file_manager, 'oval', [5, 5, 20, 20])
+    save(file_manager)
+
+    with open(file_manager.journal_path(file_manager.current_path)) as f:
+        assert not any('order' in json.loads(line) for line in f)
+    assert replay(file_manager, file_manager.current_path) == canvas_objects(file_manager)
+
+
+def test_journal_of_a_replaced_snapshot_is_ignored(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    oval = add_object(file_manager, 'oval', [5, 5, 20, 20])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+    file_manager.canvas.delete(oval)
+    del file_manager.item_meta[oval]
+    save(file_manager)
+
+    # A Save As that replaced the snapshot but was interrupted before it replaced the journal.
+    with open(file_manager.current_path, 'w') as f:
+        f.write('[{"id":0,"type":"line","coords":[1,1,2,2],"width":1,"fill":"red"}]')
+
+    assert file_manager.read_journal(file_manager.current_path) is None
+    assert [obj['fill'] for obj in replay(file_manager, file_manager.current_path)] == ['red']
+
+
+def test_torn_trailing_record_is_ignored_and_trimmed(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+    add_object(file_manager, 'oval', [5, 5, 20, 20])
+    save(file_manager)
+    journal_path = file_manager.journal_path(file_manager.current_path)
+    with open(journal_path, 'rb') as f:
+        complete = f.read()
+    with open(journal_path, 'ab') as f:
+        f.write(b'{"id":7,"type":"rec')
+
+    assert replay(file_manager, file_manager.current_path) == canvas_objects(file_manager)
+    with open(journal_path, 'rb') as f:
+        assert f.read() == complete
+
+
+def test_torn_trailing_record_is_kept_without_trim(file_manager):
+    add_object(file_manager, 'line', [0, 0, 10, 10])
+    file_manager.compact()
+    file_manager.wait_for_writes()
+    add_object(file_manager, 'oval', [5, 5, 20, 20])
+    save(file_manager)
+    journal_path = file_manager.journal_path(file_manager.current_path)
+    with open(journal_path, 'ab') as f:
+        f.write(b'{"id":7,"type":"rec')
+    with open(journal_path, 'rb') as f:
+        torn = f.read()
+
+    assert replay(file_manager, file_manager.current_path, trim=False) == canvas_objects(file_manager)
+    with open(journal_path, 'rb') as f:
+        assert f.read() == torn
+
+
+@pytest.mark.parametrize('text', ['[{}]x', '[1]', '{}', '[{},]', '[{}'])
+def test_malformed_drawing_files_are_rejected(file_manager, tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text)
+
+    with pytest.raises(ValueError):
+        replay(file_manager, str(path))
+
+
+@pytest.mark.parametrize('obj', [
+    {'type': 'line', 'coords': [0, 0, float('nan'), 1], 'width': 1, 'fill': 'black'},
+    {'type': 'oval', 'coords': [0, 0, float('inf'), 1], 'width': 1, 'fill': 'black'},
+    {'type': 'line', 'coords': [0, 0, 1, 1], 'width': 'NaN', 'fill': 'black'},
+])
+def test_objects_with_non_finite_numbers_are_rejected(file_manager, obj):
+    with pytest.raises(ValueError):
+        file_manager.check_object(0, obj)